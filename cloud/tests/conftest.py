@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Les modules de la fonction Lambda s'importent par leur nom, comme dans le paquet déployé
+CLOUD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAMBDA_DIR = os.path.join(CLOUD_DIR, "v_3_with_graph_generator")
+sys.path.insert(0, LAMBDA_DIR)
@@ -0,0 +1,26 @@
+from lambda_function import batch_output_key
+
+
+def test_prefix_with_trailing_slash():
+    assert batch_output_key("input_data/batch/g.json", "input_data/batch/", "output_data/", "json") == "output_data/ordo_g.json"
+
+
+def test_prefix_without_trailing_slash():
+    # Le chemin est relatif au dossier du préfixe : pas de segment vide dans la clé
+    key = batch_output_key("input_data/batch/g.json", "input_data/batch", "output_data/", "json")
+    assert key == "output_data/batch/ordo_g.json"
+    assert "//" not in key
+
+
+def test_prefix_ending_inside_a_name():
+    key = batch_output_key("input_data/batch_1.json", "input_data/batch", "output_data/", "json")
+    assert key == "output_data/ordo_batch_1.json"
+
+
+def test_output_prefix_without_trailing_slash():
+    assert batch_output_key("input_data/a/g.json", "input_data/", "output_data", "json") == "output_data/a/ordo_g.json"
+
+
+def test_format_and_compression_suffixes():
+    assert batch_output_key("input_data/a/g.tgb.gz", "input_data/", "output_data/", "json") == "output_data/a/ordo_g.json.gz"
+    assert batch_output_key("input_data/g.json", "input_data/", "output_data/", "binary") == "output_data/ordo_g.tsb"
@@ -0,0 +1,57 @@
+import importlib.util
+import io
+import json
+import os
+
+import pytest
+
+CLOUD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGES = ("v_3_with_graph_generator", "v_4_with_complexity_measure")
+
+GRAPH = {
+    "graph_id": "graphe_été",
+    "tasks": [
+        {"id": "tâche_é", "duration": 2, "memory": 1, "dependencies": []},
+        {"id": "任务_2", "duration": 3, "memory": 1, "dependencies": ["tâche_é"]},
+        {"id": "задача_3", "duration": 1, "memory": 2, "dependencies": ["tâche_é", "任务_2"]},
+    ],
+}
+
+
+def load_json_stream(package):
+    path = os.path.join(CLOUD_DIR, package, "json_stream.py")
+    spec = importlib.util.spec_from_file_location(f"json_stream_{package}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class OneByteStream(io.RawIOBase):
+    """ Flux qui ne rend qu'un octet par lecture, comme une lecture courte peut le faire """
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.data.read(1)
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_non_ascii_graph_read_one_byte_at_a_time(package):
+    json_stream = load_json_stream(package)
+    data = json.dumps(GRAPH, ensure_ascii=False).encode("utf-8")
+    header = {}
+    tasks = list(json_stream.iter_tasks(OneByteStream(data), header))
+    assert tasks == GRAPH["tasks"]
+    assert header == {"graph_id": "graphe_été"}
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_missing_tasks_array(package):
+    json_stream = load_json_stream(package)
+    with pytest.raises(ValueError):
+        list(json_stream.iter_tasks(io.BytesIO(b'{"graph_id": "g"}')))
@@ -0,0 +1,30 @@
+import os
+
+from lambda_function import lambda_handler
+
+
+def bucket_keys(root, bucket_name="bucket"):
+    directory = os.path.join(root, bucket_name)
+    return sorted(os.path.relpath(os.path.join(dirpath, name), directory).replace(os.sep, "/")
+                  for dirpath, _, names in os.walk(directory) for name in names)
+
+
+def event(root, **params):
+    return dict({"local_bucket_dir": str(root), "bucket_name": "bucket", "cache_prefix": "cache/",
+                 "num_tasks": 30, "num_machines": 2}, **params)
+
+
+def test_generated_graph_is_not_cached(tmp_path):
+    response = lambda_handler(event(tmp_path), None)
+    assert response["StatusCode"] == 600
+    keys = bucket_keys(tmp_path)
+    assert "output_data/ordo.json" in keys
+    assert not [key for key in keys if key.startswith("cache/")]
+
+
+def test_stored_graph_is_cached(tmp_path):
+    lambda_handler(event(tmp_path), None)
+    input_key = [key for key in bucket_keys(tmp_path) if key.startswith("output_data/task_graph_")][0]
+    response = lambda_handler(event(tmp_path, generate_a_graph=False, input_key=input_key), None)
+    assert response["StatusCode"] == 600
+    assert [key for key in bucket_keys(tmp_path) if key.startswith("cache/")]
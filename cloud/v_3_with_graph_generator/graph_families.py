@@ -0,0 +1,119 @@
+import math
+import random
+from task_graph import TaskGraph
+
+# Familles de graphes structurés, en plus du tirage "random" (parents au hasard parmi les tâches précédentes,
+# voir utilities.generate_task_graph) :
+#   layered    couches de width tâches ; chaque tâche dépend de fan tâches tirées dans la couche précédente
+#   fork_join  étapes successives : une tâche de fork, width tâches parallèles, puis une tâche de join,
+#              qui sert de fork à l'étape suivante
+#   chains     width chaînes indépendantes de tâches successives (de longueur depth)
+#   in_tree    arbre d'agrégation : chaque nœud interne attend fan fils, jusqu'à une racine finale
+#   out_tree   arbre de diffusion : chaque nœud débloque fan fils, à partir d'une racine initiale
+# Chaque graphe est construit en O(N + E) et ses tâches sont numérotées dans un ordre topologique.
+GRAPH_FAMILIES = ("layered", "fork_join", "chains", "in_tree", "out_tree")
+
+
+def family_shape(family, num_tasks=None, width=None, depth=None, fan=None):
+    """
+    Complète les paramètres d'une famille : (num_tasks, width, fan). Deux des trois grandeurs num_tasks,
+    width et depth suffisent (nombre de couches, d'étapes ou longueur des chaînes ; nombre de niveaux
+    d'un arbre complet) ; width vaut par défaut la racine carrée de num_tasks, et fan vaut 2.
+    width est None pour les arbres, dont la forme ne dépend que de fan, et fan est None pour les familles
+    fork_join et chains, qui n'en dépendent pas.
+    """
+    if family not in GRAPH_FAMILIES:
+        raise ValueError(f"Famille de graphes inconnue : {family} (choix possibles : {', '.join(GRAPH_FAMILIES)})")
+    fan = 2 if fan is None else fan
+    if fan < 1 or (width is not None and width < 1) or (depth is not None and depth < 1):
+        raise ValueError("width, depth et fan doivent être au moins égaux à 1")
+
+    if family in ("in_tree", "out_tree"):
+        if num_tasks is None:
+            if depth is None:
+                raise ValueError("num_tasks ou depth est nécessaire")
+            num_tasks = depth if fan == 1 else (fan ** depth - 1) // (fan - 1)  # Arbre complet de depth niveaux
+        width = None
+    else:
+        # Une étape de fork-join compte width + 1 tâches (les tâches parallèles et le join), plus le premier fork
+        if num_tasks is None:
+            if width is None or depth is None:
+                raise ValueError("num_tasks, ou width et depth, sont nécessaires")
+            num_tasks = depth * (width + 1) + 1 if family == "fork_join" else depth * width
+        elif width is None:
+            if depth is None:
+                width = math.isqrt(num_tasks)
+            elif family == "fork_join":
+                width = math.ceil((num_tasks - 1) / depth) - 1
+            else:
+                width = math.ceil(num_tasks / depth)
+            width = max(width, 1)
+        if family in ("fork_join", "chains"):
+            fan = None
+    if num_tasks < 1:
+        raise ValueError("Un graphe doit compter au moins une tâche")
+    return num_tasks, width, fan
+
+def family_edges(family, num_tasks, width, fan, rng):
+    """ Arcs (sources, targets) d'un graphe de la famille family, de tâches 0..num_tasks-1 """
+    n = num_tasks
+    sources, targets = [], []
+    if family == "layered":
+        for i in range(width, n):
+            first = (i // width - 1) * width  # Première tâche de la couche précédente
+            for j in rng.sample(range(first, first + width), min(fan, width)):
+                sources.append(j)
+                targets.append(i)
+    elif family == "fork_join":
+        for i in range(1, n):
+            position = (i - 1) % (width + 1)
+            start = i - position  # Première tâche parallèle de l'étape ; start - 1 est son fork
+            if position < width:
+                sources.append(start - 1)
+                targets.append(i)
+            else:
+                sources.extend(range(start, i))
+                targets.extend([i] * width)
+    elif family == "chains":
+        sources = list(range(n - width))
+        targets = list(range(width, n))
+    elif family == "out_tree":
+        sources = [(i - 1) // fan for i in range(1, n)]
+        targets = list(range(1, n))
+    else:  # in_tree : arbre de diffusion retourné, les feuilles (sources) en premier
+        sources = [n - 1 - i for i in range(1, n)]
+        targets = [n - 1 - (i - 1) // fan for i in range(1, n)]
+    return sources, targets
+
+def generate_family_graph(family, num_tasks=None, width=None, depth=None, fan=None, random_seed=None):
+    """
+    Génère un graphe compilé de la famille family (voir GRAPH_FAMILIES et family_shape pour les paramètres).
+    Durées et mémoires suivent les mêmes lois que generate_task_graph, tirées d'un random.Random(random_seed).
+    Retourne (TaskGraph, random_seed, shape) où shape = {"family", "width", "fan"}.
+    """
+    num_tasks, width, fan = family_shape(family, num_tasks, width, depth, fan)
+    if random_seed is None:
+        random_seed = random.randint(0, 99999)  # Générer une graine aléatoire
+    rng = random.Random(random_seed)
+
+    durations = [rng.randint(5, 30) for _ in range(num_tasks)]  # Durée entre 5 et 30 unités
+    memories = [rng.choice([256, 512, 1024, 2048]) for _ in range(num_tasks)]  # Mémoire en Mo
+    sources, targets = family_edges(family, num_tasks, width, fan, rng)
+    graph = TaskGraph.from_edges([f"task{i}" for i in range(1, num_tasks + 1)], durations, memories, sources, targets)
+    return graph, random_seed, {"family": family, "width": width, "fan": fan}
+
+def graph_shape(graph):
+    """
+    Forme d'un graphe compilé : nombre de tâches et d'arcs, profondeur (nombre de niveaux, voir
+    TaskGraph.levels), largeur maximale d'un niveau et parallélisme moyen (tâches par niveau).
+    """
+    levels = graph.levels()
+    counts = {}
+    for level in levels:
+        counts[level] = counts.get(level, 0) + 1
+    depth = len(counts)
+    return {"num_tasks": len(graph),
+            "num_edges": graph.num_edges,
+            "depth": depth,
+            "max_width": max(counts.values(), default=0),
+            "mean_parallelism": len(graph) / depth if depth else 0}
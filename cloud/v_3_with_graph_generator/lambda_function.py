@@ -1,56 +1,241 @@
-import networkx as nx
+import time
+_IMPORT_START = time.perf_counter()  # Mesure du coût des imports du handler (démarrage à froid)
 import json
-from min_min import read_graphe, min_min_schedule, convert_schedule_to_json
+import sys
+from min_min import read_task_graph, min_min_schedule, convert_schedule_to_json, convert_schedule_to_columns
+from graph_binary import BINARY_SUFFIX, SCHEDULE_SUFFIX, dump_schedule_columns
+from compression import COMPRESSION_SUFFIXES, encoding_from_key, key_with_encoding
+from storage import resolve_storage
+from schedule_cache import ScheduleCache, graph_digest, schedule_cache_key
 from utilities import *
-import os
+from lazy_imports import import_report
+HANDLER_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 default_event = {
     "generate_a_graph" : True,
     "num_tasks" : 1000,
     "num_machines" : 1,
     "input_key" : "input_data/graph.json",
-    "output_key" : "output_data/ordo.json",
+    "output_key" : None,  # Par défaut DEFAULT_OUTPUT_KEY suivi de l'extension de output_format
+    "output_prefix" : "output_data/",
+    "use_cache" : True,  # Sans effet sur un graphe généré par l'invocation (jamais ordonnancé deux fois)
+    "graph_format" : "json",
+    "output_format" : "json",
+    "graph_compression" : None,  # Compression du graphe généré : "gzip" ou "zstd" (celle du planning suit l'extension de output_key)
+    "graph_generator" : "python",  # "python", "legacy" (tirage de l'ancien générateur) ou "numpy" (très grands graphes)
+    "graph_family" : "random",  # "random" ou une famille de graphes structurés (voir graph_families.GRAPH_FAMILIES)
+    "family_params" : {},  # Paramètres de la famille : {"width": ..., "depth": ..., "fan": ...}
+    "validate_graph" : False,  # Vérifie que le graphe généré est acyclique (il l'est par construction)
 }
 
+# Formats du planning écrit dans le bucket : "json" (un objet par tâche, format historique), "columnar"
+# (tableaux par core, voir convert_schedule_to_columns) ou "binary" (ces mêmes colonnes en binaire)
+OUTPUT_FORMATS = ("json", "columnar", "binary")
+OUTPUT_SUFFIXES = {"json": ".json", "columnar": ".json", "binary": SCHEDULE_SUFFIX}
+DEFAULT_OUTPUT_KEY = "output_data/ordo"
+
+# Cache des plannings : le niveau en mémoire survit aux invocations tant que le conteneur reste chaud
+SCHEDULE_CACHE = ScheduleCache(max_entries=16)
+
+def schedule_graph(input_key, num_machines, output_key, use_cache=True, output_format="json", storage=None):
+    """
+    Ordonnance le graphe input_key sur num_machines machines et téléverse le planning sous output_key,
+    au format output_format (voir OUTPUT_FORMATS), en lisant et écrivant dans storage (voir storage.get_storage).
+    Retourne le résumé de l'exécution (clés, nombre de machines, makespan, succès du cache).
+    
+    Si use_cache est vrai, le contenu brut de l'objet est d'abord haché (graph_digest) et le planning
+    cherché dans SCHEDULE_CACHE : en cas de succès, le graphe n'est ni compilé ni ordonnancé. Sinon, il
+    est lu en flux et compilé à la volée (sans document JSON complet en mémoire), ou projeté en mémoire
+    s'il est au format binaire.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de planning inconnu : {output_format}")
+    # Les formats "columnar" et "binary" partagent la même forme en colonnes (seule celle-ci est mise en cache)
+    columnar = output_format != "json"
+
+    cache_params = {"layout": "columnar"} if columnar else {}
+    cache_key = schedule_cache_key(graph_digest(input_key, storage), num_machines, **cache_params) if use_cache else None
+    cached = SCHEDULE_CACHE.get(cache_key, storage) if use_cache else None
+    if cached is not None:
+        final_schedule, makespan = cached
+    else:
+        # Chargement du graphe et exécution de l'algo min_min sur le graphe compilé
+        schedule, makespan = min_min_schedule(read_task_graph(input_key, storage=storage), num_machines)
+
+        # Conversion du planning au format JSON souhaité (par tâche ou en colonnes)
+        if columnar:
+            final_schedule = convert_schedule_to_columns(schedule, num_machines)
+        else:
+            final_schedule = convert_schedule_to_json(schedule, num_machines)
+        del schedule
+        if use_cache:
+            SCHEDULE_CACHE.put(cache_key, final_schedule, makespan, storage)
+
+    # Enregistrer le planning dans le bucket, encodé au fil du téléversement (sans fichier dans /tmp)
+    if output_format == "binary":
+        write_chunks_to_bucket(dump_schedule_columns(final_schedule), output_key, storage)
+    elif columnar:
+        write_json_to_bucket(final_schedule, output_key, storage)
+    else:
+        write_json_to_bucket(final_schedule, output_key, storage, indent=4)
+
+    return {"input_key" : input_key,
+            "output_key" : output_key,
+            "num_machines" : num_machines,
+            "makespan" : makespan,
+            "cache_hit" : cached is not None}
+
+def schedule_output_key(output_key, output_format):
+    """
+    Clé du planning d'un graphe seul : DEFAULT_OUTPUT_KEY suivi de l'extension de output_format (voir
+    OUTPUT_SUFFIXES) si output_key vaut None, output_key sinon. Lève ValueError si son extension (hors
+    suffixe de compression) n'est pas celle de output_format, pour ne pas écrire un planning binaire en .json.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de planning inconnu : {output_format}")
+    suffix = OUTPUT_SUFFIXES[output_format]
+    if output_key is None:
+        return DEFAULT_OUTPUT_KEY + suffix
+    path = output_key
+    encoding = encoding_from_key(path)
+    if encoding is not None:
+        path = path[:-len(key_with_encoding("", encoding))]
+    if not path.endswith(suffix):
+        raise ValueError(f"La clé {output_key} ne convient pas au format de planning {output_format} (extension {suffix} attendue)")
+    return output_key
+
+def schedule_batch_graph(input_key, *args):
+    """
+    schedule_graph pour un graphe du batch : une erreur (graphe illisible, cycle...) est rapportée dans
+    le résumé, {"input_key", "error"}, au lieu d'interrompre les autres ordonnancements.
+    """
+    try:
+        return schedule_graph(input_key, *args)
+    except Exception as e:
+        return {"input_key" : input_key,
+                "error" : f"{type(e).__name__}: {e}"}
+
+def batch_output_key(input_key, input_prefix, output_prefix, output_format):
+    """
+    Clé du planning d'un graphe du batch : le chemin de input_key relatif au dossier de input_prefix (jusqu'à
+    son dernier "/", un préfixe pouvant s'arrêter au milieu d'un nom) est reproduit dans le dossier output_prefix,
+    le nom du fichier préfixé de "ordo_" et son extension remplacée par celle de output_format (voir
+    OUTPUT_SUFFIXES). Un graphe compressé donne un planning compressé de la même façon. Les segments vides
+    (préfixes avec ou sans "/" final, "//") sont ignorés.
+    Ex. : input_data/batch/a/g.tgb.gz, préfixe input_data/ -> output_data/batch/a/ordo_g.json.gz
+    """
+    directory = input_prefix[:input_prefix.rfind("/") + 1]
+    path = input_key[len(directory):] if input_key.startswith(directory) else input_key
+    encoding = encoding_from_key(path)
+    for suffix in (*COMPRESSION_SUFFIXES, ".json", BINARY_SUFFIX):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    name = get_file_name(path)
+    parts = [part for part in output_prefix.split("/") + path.split("/")[:-1] if part]
+    parts.append("ordo_" + name + OUTPUT_SUFFIXES[output_format])
+    return key_with_encoding("/".join(parts), encoding)
+
+def batch_jobs(event, storage=None):
+    """
+    Liste des ordonnancements (input_key, num_machines, output_key, use_cache, output_format, storage) demandés par un événement batch :
+    les graphes sont donnés par "input_keys" (liste de clés) ou "input_prefix" (tous les objets du préfixe),
+    et "num_machines" est soit un nombre commun, soit une liste (une valeur par graphe), soit un
+    dictionnaire { input_key: num_machines }. Les plannings sont écrits sous "output_prefix" (voir batch_output_key).
+    """
+    input_prefix = event.get("input_prefix", "")
+    if "input_keys" in event:
+        input_keys = event["input_keys"]
+    else:
+        input_keys = list_bucket_keys(input_prefix, storage)
+
+    num_machines = event["num_machines"]
+    if isinstance(num_machines, list):
+        if len(num_machines) != len(input_keys):
+            raise ValueError(f"{len(num_machines)} nombres de machines pour {len(input_keys)} graphes")
+        machines_per_graph = num_machines
+    elif isinstance(num_machines, dict):
+        machines_per_graph = [num_machines[key] for key in input_keys]
+    else:
+        machines_per_graph = [num_machines] * len(input_keys)
+
+    output_format = event["output_format"]
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de planning inconnu : {output_format}")
+    output_keys = {}
+    for key in input_keys:
+        output_key = batch_output_key(key, input_prefix, event["output_prefix"], output_format)
+        if output_key in output_keys:
+            raise ValueError(f"Les graphes {output_keys[output_key]} et {key} auraient le même planning {output_key}")
+        output_keys[output_key] = key
+
+    return [(key, m, output_key, event["use_cache"], output_format, storage)
+            for key, m, output_key in zip(input_keys, machines_per_graph, output_keys)]
+
 def lambda_handler(event, context):
     try:
         # Pour se prémunir des infos manquantes dans event, on initialise les infos manquantes avec default_event
         for k in default_event:
             if not k in event:
                 event[k]=default_event[k]
-        
+
+        # Bucket, préfixes, ou dossier local qui tient lieu de bucket hors AWS : résolus pour cette invocation
+        # seulement et passés explicitement (y compris aux processus du batch), sans toucher à l'environnement
+        storage = resolve_storage(event)
+
+        # Génération d'une grille de graphes (corpus de test) en parallèle, un processus par vCPU :
+        # "graph_grid" : {"num_tasks": [...], "max_dependencies": [...], "seeds": [...] ou "num_seeds" et "base_seed"}
+        if "graph_grid" in event:
+            grid = event["graph_grid"]
+            results = generate_graph_grid(grid["num_tasks"], grid.get("max_dependencies", [None]), grid.get("seeds"),
+                                          grid.get("num_seeds", 1), grid.get("base_seed", 0), event["graph_format"],
+                                          event["graph_compression"], event["graph_generator"], event.get("workers"),
+                                          event["validate_graph"], storage)
+            return {"StatusCode" : 600,
+                    "body" : f"{len(results)} graphes générés ont été téléversés dans le S3.",
+                    "graph_bucket_keys" : [result["graph_bucket_key"] for result in results],
+                    "import_report" : import_report(HANDLER_IMPORT_SECONDS)}
+
+        # Mode batch : plusieurs graphes ordonnancés en parallèle, un processus par vCPU
+        if "input_keys" in event or "input_prefix" in event:
+            results = parallel_map(schedule_batch_graph, batch_jobs(event, storage), event.get("workers"))
+            failed = sum("error" in result for result in results)
+            return {"StatusCode" : 600,
+                    "body" : f"{len(results) - failed} ordonnancements ont été téléversés dans le S3, {failed} en échec.",
+                    "results" : results,
+                    "import_report" : import_report(HANDLER_IMPORT_SECONDS)}
+
         # Récupération des informations nécessaires au lancement de l'ordonnancement
+        # (clé du planning vérifiée avant de générer le graphe)
+        output_key = schedule_output_key(event["output_key"], event["output_format"])
         if event["generate_a_graph"]:
-            input_key = graph_generator(event["num_tasks"])["graph_bucket_key"]
+            input_key = graph_generator(event["num_tasks"], graph_format=event["graph_format"],
+                                        compression=event["graph_compression"],
+                                        generator=event["graph_generator"], family=event["graph_family"],
+                                        validate=event["validate_graph"], storage=storage,
+                                        **event["family_params"])["graph_bucket_key"]
         else :
             input_key = event["input_key"]
         num_machines = event['num_machines']
-        output_key = event['output_key']
-        
-        # Chargement du graphe
-        G = read_graphe(input_key)
-        
-        # Exécution de l'algo min_min
-        schedule, makespan = min_min_schedule(G, num_machines)
-        
-        # Conversion du planning en format JSON souhaité
-        final_schedule = convert_schedule_to_json(schedule, num_machines)
-
-        # Enregistrer le graphe dans un fichier JSON
-        output_local_path = '/tmp/'+get_file_name(output_key)
-        with open(output_local_path, 'w') as f:
-            json.dump(final_schedule, f, indent=4)
-        
-        upload_on_bucket(output_local_path, output_key)
-        
-        if os.path.exists(output_local_path):  # Supprimer le fichier temporaire après utilisation
-            os.remove(output_local_path)
-        
+        # Un graphe qui vient d'être généré (graine aléatoire) ne peut pas être dans le cache, et son planning
+        # n'y serait jamais relu : ni empreinte, ni recherche, ni copie du planning sous le préfixe du cache
+        use_cache = event["use_cache"] and not event["generate_a_graph"]
+
+        makespan = schedule_graph(input_key, num_machines, output_key, use_cache, event["output_format"],
+                                  storage)["makespan"]
+
         return {"StatusCode" : 600,
-                "body" : f"L'ordonnancement a été téléversé en tant que {output_key} dans le S3. Le makespan est de {makespan}"}
+                "body" : f"L'ordonnancement a été téléversé en tant que {output_key} dans le S3. Le makespan est de {makespan}",
+                "import_report" : import_report(HANDLER_IMPORT_SECONDS)}
 
     except Exception as e:
         return {
             "statusCode": 500,
             "body": f"Une erreur s'est produite : {str(e)}"
-        }
\ No newline at end of file
+        }
+
+if __name__ == "__main__":
+    # Exécution locale : python lambda_function.py event.json (avec "local_bucket_dir" dans l'événement
+    # ou la variable d'environnement LOCAL_BUCKET_DIR pour se passer de S3, voir storage.STORAGE_EVENT_KEYS)
+    with open(sys.argv[1], "r") as f:
+        event = json.load(f)
+    print(json.dumps(lambda_handler(event, None), indent=4))
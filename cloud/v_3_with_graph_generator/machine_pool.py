@@ -0,0 +1,80 @@
+class MachinePool:
+    """
+    Disponibilité des machines (cores identiques), rangée dans un arbre de tournoi :
+    un tas binaire complet dont les feuilles sont les dates de disponibilité des machines
+    et dont chaque nœud interne contient le minimum de ses deux fils.
+
+    - earliest() : date de disponibilité la plus précoce, en O(1)
+    - best_for(t) : meilleure machine pour une tâche dont les dépendances finissent à t, en O(log M)
+    - assign(m, t) : la machine m devient disponible à la date t, en O(log M)
+
+    best_for reproduit exactement la règle historique (parcours des machines par indice croissant
+    avec comparaison stricte) : la machine retenue est celle de plus petit indice parmi celles qui
+    permettent de démarrer le plus tôt.
+    """
+
+    __slots__ = ("num_machines", "size", "tree", "latest")
+
+    def __init__(self, num_machines):
+        self.num_machines = num_machines
+        size = 1
+        while size < num_machines:
+            size *= 2
+        self.size = size
+        # Les feuilles de bourrage (machines inexistantes) ne sont jamais disponibles
+        self.tree = [float('inf')] * (2 * size)
+        for m in range(num_machines):
+            self.tree[size + m] = 0
+        for i in range(size - 1, 0, -1):
+            self.tree[i] = min(self.tree[2 * i], self.tree[2 * i + 1])
+        self.latest = 0
+
+    def __len__(self):
+        return self.num_machines
+
+    def ready_time(self, m):
+        return self.tree[self.size + m]
+
+    def ready_times(self):
+        return self.tree[self.size:self.size + self.num_machines]
+
+    def earliest(self):
+        """ Date à laquelle la première machine se libère """
+        return self.tree[1]
+
+    def makespan(self):
+        """ Date de libération de la dernière machine """
+        return self.latest
+
+    def first_ready_by(self, t):
+        """ Machine de plus petit indice disponible au plus tard à la date t (None si aucune) """
+        tree = self.tree
+        if tree[1] > t:
+            return None
+        i = 1
+        while i < self.size:
+            i *= 2
+            if tree[i] > t:
+                i += 1
+        return i - self.size
+
+    def best_for(self, earliest_dep_finish):
+        """
+        Retourne (machine, start_time) minimisant la date de début d'une tâche dont les dépendances
+        se terminent à earliest_dep_finish. La durée étant la même sur toutes les machines, c'est aussi
+        la machine qui minimise la date de fin.
+        """
+        start_time = max(self.tree[1], earliest_dep_finish)
+        return self.first_ready_by(start_time), start_time
+
+    def assign(self, m, ready_time):
+        """ Met à jour la date de disponibilité de la machine m """
+        tree = self.tree
+        i = self.size + m
+        tree[i] = ready_time
+        i //= 2
+        while i:
+            tree[i] = min(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+        if ready_time > self.latest:
+            self.latest = ready_time
@@ -1,6 +1,23 @@
-import networkx as nx
 import json
+from array import array
+from heapq import heappush, heappop
+from lazy_imports import lazy_import
 from utilities import *
+from task_graph import TaskGraph, CompiledSchedule, parse_dependency, typecode_of
+from graph_binary import BINARY_MAGIC, is_binary_graph_key, load_task_graph
+from storage import get_storage
+from compression import PrefixedStream
+from machine_pool import MachinePool
+from resource_profile import ResourceProfile
+
+
+def _numpy():
+    """ NumPy, importé au premier usage du moteur vectorisé ; None s'il n'est pas installé """
+    try:
+        return lazy_import("numpy")
+    except ImportError:  # NumPy n'est pas fourni par la couche Lambda : le mode vectorisé se rabat sur le tas
+        return None
+
 
 def parse_time(time_str):
     """
@@ -19,56 +36,164 @@ def parse_time(time_str):
     
     return h * 3600 + m * 60 + s + fraction 
 
-def read_graphe(input_key="input_data/graph.json", data=None):
+def load_graph_data(input_key="input_data/graph.json"):
+    """ Lit un graphe de tâches dans le bucket (directement en mémoire) et retourne son contenu JSON (dictionnaire) """
+    with open_from_bucket(input_key) as stream:
+        return json.load(stream)
+
+def read_task_graph(input_key="input_data/graph.json", header=None, on_task=None, on_buffer=None, storage=None):
+    """
+    Lit un graphe de tâches depuis le bucket et le compile directement en TaskGraph, sans document JSON
+    ni graphe NetworkX intermédiaires. Le format est reconnu à l'extension de la clé (BINARY_SUFFIX) ou,
+    à défaut, aux premiers octets de l'objet :
+      - JSON : lu en flux, voir TaskGraph.from_json_stream pour header et on_task ;
+      - binaire : projeté en mémoire et chargé sans analyse (graph_binary.load_task_graph), les métadonnées
+        enregistrées avec le graphe vont dans header, et on_buffer (si fourni) reçoit le contenu de l'objet.
+    storage : stockage où lire le graphe (voir storage.get_storage).
+    """
+    storage = get_storage(storage)
+    if is_binary_graph_key(input_key):
+        buffer = storage.map(input_key)
+    else:
+        with storage.open(input_key) as stream:
+            magic = stream.read(len(BINARY_MAGIC))
+            if magic != BINARY_MAGIC:
+                return TaskGraph.from_json_stream(PrefixedStream(magic, stream), header, on_task)
+            buffer = magic + stream.read()
+    if on_buffer is not None:
+        on_buffer(buffer)
+    return load_task_graph(buffer, header)
+
+def read_graphe(input_key="input_data/graph.json", data=None, as_networkx=True):
     """
     Charge un graphe de tâches depuis un fichier json.
     Les tâches utilisent leur attribut "id" comme nom.
-    """
-    local_file_path = "/tmp/"+get_file_name(input_key)
-    download_from_bucket(local_file_path, input_key)
     
-    # Charger les données JSON depuis le fichier téléchargé
-    with open(local_file_path, "r") as file:
-        data = json.load(file)
+    Avec as_networkx=False, le graphe est directement compilé en TaskGraph (listes d'adjacence en tableaux,
+    voir read_task_graph) sans que NetworkX soit chargé : c'est tout ce dont min_min_schedule a besoin.
+    Le DiGraph n'est à construire que pour manipuler le graphe avec NetworkX (affichage, analyses...).
+    
+    Pour des cores hétérogènes, le fichier peut donner un facteur de vitesse par core
+    ("core_speeds" : une tâche dure duration / speed sur chaque core) et/ou, par tâche, sa ligne
+    de la matrice ETC ("etc" : durée sur chaque core), qui est alors prioritaire.
+    
+    Une dépendance peut aussi être un objet {"id": ..., "latency": ..., "data_size": ...} : son coût de
+    communication (latency + data_size / "bandwidth") est stocké dans l'attribut "cost" de l'arc.
+    """
+    if not as_networkx:
+        return read_task_graph(input_key) if data is None else TaskGraph.from_graph_data(data)
+    if data is None:
+        data = load_graph_data(input_key)
 
+    nx = lazy_import("networkx")
     G = nx.DiGraph()
+    if "core_speeds" in data:
+        G.graph["core_speeds"] = data["core_speeds"]
     
     for task in data["tasks"]:
         # On utilise "id" pour nommer la tâche
         G.add_node(task["id"], time=task["duration"], memory=task["memory"])
+        if "etc" in task:
+            G.nodes[task["id"]]["etc"] = task["etc"]
         for dep in task["dependencies"]:
-            G.add_edge(dep, task["id"])
+            dep_id, cost = parse_dependency(dep, data.get("bandwidth"))
+            if cost is None:
+                G.add_edge(dep_id, task["id"])
+            else:
+                G.add_edge(dep_id, task["id"], cost=cost)
     
     return G
 
-def get_ready_tasks(G, unscheduled, schedule):
+def update_ready_tasks(graph, ready_tasks, remaining_deps, data_ready, completed_task, completed_finish):
+    """
+    Met à jour l'ensemble des tâches prêtes (ready_tasks) : chaque successeur de la tâche complétée
+    a une dépendance restante de moins, et devient prêt quand son compteur tombe à zéro.
+    Chaque arc du graphe n'est ainsi parcouru qu'une seule fois par ordonnancement.
+    
+    data_ready[succ] (fin de la dernière dépendance planifiée) est mis à jour au passage : il est
+    définitif dès que succ est prêt, et l'évaluation des candidats n'a plus à parcourir les arcs.
+    """
+    for succ in graph.successors(completed_task):
+        if completed_finish > data_ready[succ]:
+            data_ready[succ] = completed_finish
+        remaining_deps[succ] -= 1
+        if remaining_deps[succ] == 0:
+            ready_tasks.add(succ)
+
+def communication_ready(graph, task, schedule):
     """
-    Retourne la liste des tâches prêtes à être planifiées.
-    Une tâche est prête si toutes ses dépendances (prédécesseurs)
-    sont déjà planifiées.
+    Dates de disponibilité des données d'une tâche prête quand les dépendances ont un coût de communication.
+    
+    Retourne (remote_ready, local_ready) : remote_ready est la date à laquelle toutes les données sont
+    disponibles sur un core qui n'a exécuté aucun prédécesseur (tous les transferts sont payés), et
+    local_ready donne, pour les seuls cores qui ont exécuté un prédécesseur, une date plus précoce
+    (les données produites sur place ne sont pas transférées). Calculé une fois, quand la tâche devient
+    prête, en O(degré entrant) : l'évaluation des candidats ne coûte ensuite pas M fois plus.
     """
-    ready_tasks = []
-    for task in unscheduled:
-        preds = list(G.predecessors(task))
-        if all(pred in schedule for pred in preds):
-            ready_tasks.append(task)
-    return ready_tasks
+    local_finish = {}  # core -> fin du dernier prédécesseur exécuté sur ce core
+    remote_arrival = {}  # core -> arrivée ailleurs de la dernière donnée produite sur ce core
+    for k in range(graph.pred_offsets[task], graph.pred_offsets[task + 1]):
+        pred = graph.pred_indices[k]
+        m = schedule.machine[pred]
+        finish_time = schedule.finish[pred]
+        if finish_time > local_finish.get(m, 0):
+            local_finish[m] = finish_time
+        if finish_time + graph.pred_costs[k] > remote_arrival.get(m, 0):
+            remote_arrival[m] = finish_time + graph.pred_costs[k]
+    
+    # Les deux plus tardives arrivées provenant de cores distincts
+    first_core, first, second = None, 0, 0
+    for m, arrival in remote_arrival.items():
+        if arrival > first:
+            first_core, first, second = m, arrival, first
+        elif arrival > second:
+            second = arrival
+    
+    local_ready = {}
+    for m, finish_time in local_finish.items():
+        ready_time = max(finish_time, second if m == first_core else first)
+        if ready_time < first:
+            local_ready[m] = ready_time
+    return first, local_ready
 
-def best_assignment_for_task(G, task, schedule, machine_ready):
+def best_assignment_for_task(graph, task, data_ready, machines, comm_ready=None):
     """
-    Pour une tâche donnée, détermine sur quelle machine et à quel moment elle peut être exécutée
-    pour se terminer le plus tôt possible.
+    Pour une tâche donnée (indice dans le TaskGraph), détermine sur quelle machine et à quel moment
+    elle peut être exécutée pour se terminer le plus tôt possible.
+    Si les machines sont identiques, c'est la machine libre le plus tôt (à indice minimal en cas
+    d'égalité) : la requête sur le MachinePool coûte O(log M). Sinon, chaque core est évalué avec
+    la durée de la tâche donnée par la matrice ETC.
+    
+    Avec des coûts de communication, comm_ready[task] contient (remote_ready, local_ready) calculé par
+    communication_ready : seuls les cores de local_ready sont évalués en plus de la requête sur le pool.
     """
-    task_time = G.nodes[task].get("time", 1)
-    preds = list(G.predecessors(task))
-    earliest_dep_finish = max([schedule[pred][2] for pred in preds], default=0)
+    if comm_ready is None:
+        earliest_dep_finish, local_ready = data_ready[task], None
+    else:
+        earliest_dep_finish, local_ready = comm_ready[task]
+    
+    if graph.etc is None:
+        task_time = graph.durations[task]
+        best_machine, best_start_time = machines.best_for(earliest_dep_finish)
+        best_finish_time = best_start_time + task_time
+        if local_ready:
+            # Cores qui ont exécuté un prédécesseur : les données y sont disponibles plus tôt
+            for m, dep_finish in local_ready.items():
+                start_time = max(machines.ready_time(m), dep_finish)
+                finish_time = start_time + task_time
+                if finish_time < best_finish_time or (finish_time == best_finish_time and m < best_machine):
+                    best_finish_time = finish_time
+                    best_machine = m
+                    best_start_time = start_time
+        return best_machine, best_start_time, best_finish_time
     
     best_machine = None
     best_start_time = None
     best_finish_time = float('inf')
     
-    for m, ready_time in enumerate(machine_ready):
-        start_time = max(ready_time, earliest_dep_finish)
+    for m, (ready_time, task_time) in enumerate(zip(machines.ready_times(), graph.etc_row(task))):
+        dep_finish = local_ready.get(m, earliest_dep_finish) if local_ready else earliest_dep_finish
+        start_time = max(ready_time, dep_finish)
         finish_time = start_time + task_time
         if finish_time < best_finish_time:
             best_finish_time = finish_time
@@ -76,20 +201,24 @@ def best_assignment_for_task(G, task, schedule, machine_ready):
             best_start_time = start_time
     return best_machine, best_start_time, best_finish_time
 
-def min_min_schedule(G, num_machines):
+def _min_min_scan(graph, machines, schedule):
     """
-    Implémente l'algorithme Min-Min pour le scheduling sur 'num_machines' machines.
-    
-    Retourne un dictionnaire de planning sous la forme :
-      { tâche: (machine, start_time, finish_time) }
-    ainsi que le makespan global.
+    Moteur de référence : à chaque étape, évalue toutes les tâches prêtes et retient celle qui se termine
+    le plus tôt. Coût O(R log M) par étape pour R tâches prêtes, sans parcours des arcs.
+    C'est aussi le moteur des graphes avec coûts de communication (dates par core mises en cache).
     """
-    machine_ready = [0] * num_machines  # Temps de disponibilité initial pour chaque machine
-    schedule = {}
-    unscheduled = set(G.nodes())
+    n = len(graph)
+    remaining_deps = graph.in_degrees()  # Nombre de dépendances non encore planifiées
+    data_ready = array(graph.time_typecode, [0]) * n  # Fin de la dernière dépendance planifiée
+    comm_ready = {} if graph.pred_costs is not None else None  # Dates par core des tâches prêtes
     
-    while unscheduled:
-        ready_tasks = get_ready_tasks(G, unscheduled, schedule)
+    # Initialisation : tâches sans prédécesseurs sont prêtes
+    ready_tasks = { task for task in range(n) if remaining_deps[task] == 0 }
+    if comm_ready is not None:
+        for task in ready_tasks:
+            comm_ready[task] = (0, None)
+    
+    while len(schedule) < n:
         if not ready_tasks:
             raise Exception("Aucune tâche prête : le graphe comporte peut-être un cycle.")
         
@@ -98,25 +227,474 @@ def min_min_schedule(G, num_machines):
         best_start = None
         best_finish = float('inf')
         
+        # Sélection de la tâche optimale parmi ready_tasks
         for task in ready_tasks:
-            m, start, finish = best_assignment_for_task(G, task, schedule, machine_ready)
-            if finish < best_finish:
-                best_finish = finish
+            m, s, f = best_assignment_for_task(graph, task, data_ready, machines, comm_ready)
+            if f < best_finish or (f == best_finish and task < best_task):
+                best_finish = f
                 best_task = task
                 best_machine = m
-                best_start = start
-                
+                best_start = s
+        
+        # Planification de la tâche sélectionnée
+        schedule.place(best_task, best_machine, best_start, best_finish)
+        machines.assign(best_machine, best_finish)
+        ready_tasks.remove(best_task)
+        
+        # Mise à jour incrémentale des tâches prêtes pour les successeurs de la tâche planifiée
+        if comm_ready is None:
+            update_ready_tasks(graph, ready_tasks, remaining_deps, data_ready, best_task, best_finish)
+        else:
+            del comm_ready[best_task]
+            newly_ready = set()
+            update_ready_tasks(graph, newly_ready, remaining_deps, data_ready, best_task, best_finish)
+            for task in newly_ready:
+                comm_ready[task] = communication_ready(graph, task, schedule)
+            ready_tasks |= newly_ready
+
+def _min_min_heap(graph, machines, schedule):
+    """
+    Moteur à files de priorité, qui produit exactement le même planning que _min_min_scan.
+    
+    Avec des machines identiques, une tâche prête de durée p dont les dépendances finissent à d se
+    termine au plus tôt à max(d, e) + p, où e est la date de libération de la première machine. Les
+    tâches prêtes sont donc réparties en deux tas :
+      - débloquées (d <= e), clé (p, tâche) : elles finissent toutes à e + p ;
+      - bloquées (d > e), clé (d + p, tâche) : elles finissent à d + p.
+    e ne fait que croître : un troisième tas, clé (d, tâche), fait passer les tâches bloquées vers le tas
+    des débloquées dès que e les rattrape (les entrées périmées sont ignorées au dépilement).
+    Chaque étape coûte O(log R + log M).
+    """
+    n = len(graph)
+    durations = graph.durations
+    data_ready = array(graph.time_typecode, [0]) * n  # Fin de la dernière dépendance planifiée
+    remaining_deps = graph.in_degrees()  # Nombre de dépendances non encore planifiées
+    blocked = bytearray(n)
+    unblocked_by_duration = []
+    blocked_by_data_ready = []
+    blocked_by_finish = []
+    
+    def push_ready(task):
+        d = data_ready[task]
+        if d > machines.earliest():
+            blocked[task] = 1
+            heappush(blocked_by_data_ready, (d, task))
+            heappush(blocked_by_finish, (d + durations[task], task))
+        else:
+            heappush(unblocked_by_duration, (durations[task], task))
+    
+    # Initialisation : tâches sans prédécesseurs sont prêtes
+    for task in range(n):
+        if remaining_deps[task] == 0:
+            push_ready(task)
+    
+    while len(schedule) < n:
+        earliest = machines.earliest()
+        
+        # Les tâches dont les dépendances finissent avant la première machine libre sont débloquées
+        while blocked_by_data_ready and blocked_by_data_ready[0][0] <= earliest:
+            _, task = heappop(blocked_by_data_ready)
+            if blocked[task]:
+                blocked[task] = 0
+                heappush(unblocked_by_duration, (durations[task], task))
+        while blocked_by_finish and not blocked[blocked_by_finish[0][1]]:
+            heappop(blocked_by_finish)
+        
+        if not unblocked_by_duration and not blocked_by_finish:
+            raise Exception("Aucune tâche prête : le graphe comporte peut-être un cycle.")
+        
+        # Sélection de la tâche optimale : meilleur candidat de chacun des deux tas
+        if blocked_by_finish and (not unblocked_by_duration
+                                  or blocked_by_finish[0] < (earliest + unblocked_by_duration[0][0], unblocked_by_duration[0][1])):
+            best_finish, best_task = heappop(blocked_by_finish)
+            blocked[best_task] = 0
+        else:
+            task_time, best_task = heappop(unblocked_by_duration)
+            best_finish = earliest + task_time
+        best_machine, best_start = machines.best_for(data_ready[best_task])
+        
+        # Planification de la tâche sélectionnée
+        schedule.place(best_task, best_machine, best_start, best_finish)
+        machines.assign(best_machine, best_finish)
+        
+        # Mise à jour incrémentale des tâches prêtes pour les successeurs de la tâche planifiée
+        newly_ready = set()
+        update_ready_tasks(graph, newly_ready, remaining_deps, data_ready, best_task, best_finish)
+        for task in newly_ready:
+            push_ready(task)
+
+def _min_min_numpy(graph, machines, schedule):
+    """
+    Moteur vectorisé pour les fronts de tâches prêtes très larges : les dates de fin des dépendances
+    et les durées des tâches prêtes sont rangées dans des tableaux NumPy, et chaque étape calcule
+    toutes les dates de fin candidates max(d, e) + p puis leur argmin en une seule opération.
+    Même planning que _min_min_scan. Sans NumPy (absent de la couche Lambda), on se rabat sur _min_min_heap
+    (ou sur _min_min_scan pour des cores hétérogènes).
+    """
+    np = _numpy()
+    if np is None:
+        if graph.etc is not None:
+            return _min_min_scan(graph, machines, schedule)
+        return _min_min_heap(graph, machines, schedule)
+    if graph.etc is not None:
+        return _min_min_numpy_etc(graph, machines, schedule)
+    
+    n = len(graph)
+    durations = graph.durations
+    dtype = np.int64 if graph.time_typecode == "q" else np.float64
+    remaining_deps = graph.in_degrees()  # Nombre de dépendances non encore planifiées
+    data_ready = array(graph.time_typecode, [0]) * n  # Fin de la dernière dépendance planifiée
+    
+    # Front des tâches prêtes : indices, fin des dépendances et durées (les size premières cases sont valides)
+    front_tasks = np.empty(16, dtype=np.int64)
+    front_ready = np.empty(16, dtype=dtype)
+    front_time = np.empty(16, dtype=dtype)
+    size = 0
+    
+    def push_ready(tasks):
+        nonlocal front_tasks, front_ready, front_time, size
+        count = len(tasks)
+        if size + count > len(front_tasks):
+            capacity = max(2 * len(front_tasks), size + count)
+            front_tasks = np.resize(front_tasks, capacity)
+            front_ready = np.resize(front_ready, capacity)
+            front_time = np.resize(front_time, capacity)
+        front_tasks[size:size + count] = tasks
+        front_ready[size:size + count] = [data_ready[task] for task in tasks]
+        front_time[size:size + count] = [durations[task] for task in tasks]
+        size += count
+    
+    # Initialisation : tâches sans prédécesseurs sont prêtes
+    push_ready([task for task in range(n) if remaining_deps[task] == 0])
+    
+    while len(schedule) < n:
+        if not size:
+            raise Exception("Aucune tâche prête : le graphe comporte peut-être un cycle.")
+        
+        # Évaluation de tout le front en une opération, à égalité la tâche de plus petit indice
+        candidates = np.maximum(front_ready[:size], machines.earliest()) + front_time[:size]
+        best = np.flatnonzero(candidates == candidates.min())
+        pos = best[np.argmin(front_tasks[best])] if len(best) > 1 else best[0]
+        best_task = int(front_tasks[pos])
+        
+        # Retrait du front : la dernière tâche prend la place de la tâche choisie
+        size -= 1
+        front_tasks[pos] = front_tasks[size]
+        front_ready[pos] = front_ready[size]
+        front_time[pos] = front_time[size]
+        
+        # Planification de la tâche sélectionnée
+        best_machine, best_start, best_finish = best_assignment_for_task(graph, best_task, data_ready, machines)
+        schedule.place(best_task, best_machine, best_start, best_finish)
+        machines.assign(best_machine, best_finish)
+        
+        # Mise à jour incrémentale des tâches prêtes pour les successeurs de la tâche planifiée
+        newly_ready = set()
+        update_ready_tasks(graph, newly_ready, remaining_deps, data_ready, best_task, best_finish)
+        if newly_ready:
+            push_ready(list(newly_ready))
+
+def _min_min_numpy_etc(graph, machines, schedule):
+    """
+    Moteur vectorisé pour des cores hétérogènes : à chaque étape, la matrice (tâches prêtes × cores)
+    des dates de fin max(d, r_m) + ETC[t, m] est calculée en une opération NumPy, puis réduite à son
+    minimum (à égalité, la tâche de plus petit indice puis le core de plus petit indice).
+    """
+    np = _numpy()
+    n = len(graph)
+    num_cores = graph.num_cores
+    etc = np.frombuffer(graph.etc, dtype=np.int64 if typecode_of(graph.etc) == "q" else np.float64).reshape(n, num_cores)
+    remaining_deps = graph.in_degrees()  # Nombre de dépendances non encore planifiées
+    data_ready = array(graph.time_typecode, [0]) * n  # Fin de la dernière dépendance planifiée
+    ready_times = np.zeros(num_cores, dtype=etc.dtype)  # Copie NumPy des disponibilités du MachinePool
+    
+    # Front des tâches prêtes (indices et fin des dépendances) ; les size premières cases sont valides
+    front_tasks = np.empty(16, dtype=np.int64)
+    front_ready = np.empty(16, dtype=etc.dtype)
+    size = 0
+    
+    def push_ready(tasks):
+        nonlocal front_tasks, front_ready, size
+        count = len(tasks)
+        if size + count > len(front_tasks):
+            capacity = max(2 * len(front_tasks), size + count)
+            front_tasks = np.resize(front_tasks, capacity)
+            front_ready = np.resize(front_ready, capacity)
+        front_tasks[size:size + count] = tasks
+        front_ready[size:size + count] = [data_ready[task] for task in tasks]
+        size += count
+    
+    # Initialisation : tâches sans prédécesseurs sont prêtes
+    push_ready([task for task in range(n) if remaining_deps[task] == 0])
+    
+    while len(schedule) < n:
+        if not size:
+            raise Exception("Aucune tâche prête : le graphe comporte peut-être un cycle.")
+        
+        # Évaluation de tous les couples (tâche prête, core) en une opération
+        tasks = front_tasks[:size]
+        candidates = np.maximum(front_ready[:size, None], ready_times[None, :]) + etc[tasks]
+        rows, cols = np.nonzero(candidates == candidates.min())
+        # np.nonzero parcourt ligne par ligne : la première occurrence de la plus petite tâche a le plus petit core
+        k = np.argmin(tasks[rows])
+        pos = rows[k]
+        best_task = int(tasks[pos])
+        best_machine = int(cols[k])
+        
+        # Retrait du front : la dernière tâche prend la place de la tâche choisie
+        size -= 1
+        front_tasks[pos] = front_tasks[size]
+        front_ready[pos] = front_ready[size]
+        
         # Planification de la tâche sélectionnée
-        schedule[best_task] = (best_machine, best_start, best_finish)
-        machine_ready[best_machine] = best_finish  # Mise à jour de la disponibilité de la machine
-        unscheduled.remove(best_task)
+        best_start = max(machines.ready_time(best_machine), data_ready[best_task])
+        best_finish = best_start + graph.etc[best_task * num_cores + best_machine]
+        schedule.place(best_task, best_machine, best_start, best_finish)
+        machines.assign(best_machine, best_finish)
+        ready_times[best_machine] = best_finish
+        
+        # Mise à jour incrémentale des tâches prêtes pour les successeurs de la tâche planifiée
+        newly_ready = set()
+        update_ready_tasks(graph, newly_ready, remaining_deps, data_ready, best_task, best_finish)
+        if newly_ready:
+            push_ready(list(newly_ready))
+
+def _host_assignment(graph, task, data_ready, host):
+    """
+    Meilleure affectation de task sur un hôte (first_core, pool, profile) en mode mémoire contrainte :
+    la tâche démarre au plus tôt quand un de ses cores est libre, ses dépendances terminées, et que
+    le profil mémoire de l'hôte peut absorber graph.memories[task] pendant toute son exécution.
+    Retourne (machine, start_time, finish_time), machine étant l'indice global du core.
+    """
+    first_core, pool, profile = host
+    earliest_dep_finish = data_ready[task]
+    memory = graph.memories[task]
+    if graph.etc is None:
+        # earliest_fit est croissante : le core libre le plus tôt de l'hôte est le meilleur
+        task_time = graph.durations[task]
+        start_time = profile.earliest_fit(max(pool.earliest(), earliest_dep_finish), task_time, memory)
+        return first_core + pool.first_ready_by(start_time), start_time, start_time + task_time
+    
+    best_machine = None
+    best_start_time = None
+    best_finish_time = float('inf')
+    for m, ready_time in enumerate(pool.ready_times()):
+        task_time = graph.etc[task * graph.num_cores + first_core + m]
+        start_time = profile.earliest_fit(max(ready_time, earliest_dep_finish), task_time, memory)
+        finish_time = start_time + task_time
+        if finish_time < best_finish_time:
+            best_finish_time = finish_time
+            best_machine = first_core + m
+            best_start_time = start_time
+    return best_machine, best_start_time, best_finish_time
+
+def _min_min_memory(graph, machines, schedule, memory_limits, cores_per_host):
+    """
+    Min-Min à mémoire contrainte : les cores sont regroupés en hôtes de cores_per_host cores, chacun doté
+    d'une capacité mémoire (memory_limits). Une tâche ne démarre que si la mémoire des tâches qui
+    tournent en même temps sur l'hôte, plus la sienne, reste dans la capacité. Chaque hôte tient un
+    ResourceProfile de sa consommation, élagué à la date de libération de son premier core.
+    
+    Les candidats sont rangés dans un tas, clé (fin, tâche, core). Une affectation ne modifie que son
+    hôte, et ne peut que retarder les tâches qui y seraient placées : une clé calculée avant reste un
+    minorant. Chaque entrée porte donc la version de son hôte au moment du calcul ; une entrée périmée
+    n'est réévaluée que lorsqu'elle arrive en tête du tas, et la première entrée à jour dépilée est le
+    meilleur couple, exactement comme le parcours exhaustif. Une tâche qui devient prête entre dans le
+    tas avec un simple minorant, sans appel à earliest_fit.
+    
+    Avec des cores identiques, comme pour _min_min_heap, les tâches débloquées d'un hôte (dépendances
+    finies avant la libération de son premier core) de même durée et de même mémoire s'y terminent toutes
+    à la même date : elles forment une classe, et seule la plus petite tâche de chaque classe a une entrée
+    dans le tas. Les tâches bloquées ont chacune la leur, jusqu'à ce que l'hôte les rattrape.
+    """
+    n = len(graph)
+    num_hosts = len(memory_limits)
+    hosts = [(h * cores_per_host, MachinePool(cores_per_host), ResourceProfile(memory_limits[h]))
+             for h in range(num_hosts)]
     
-    makespan = max(machine_ready)
+    # Hôtes capables d'accueillir chaque niveau de mémoire demandé (mémoire <= capacité)
+    eligible = {}
+    for task in range(n):
+        memory = graph.memories[task]
+        if memory not in eligible:
+            eligible[memory] = [h for h in range(num_hosts) if memory <= memory_limits[h]]
+        if not eligible[memory]:
+            raise ValueError(f"La tâche {graph.ids[task]} demande {memory} Mo, plus que la capacité de tous les hôtes")
+    
+    remaining_deps = graph.in_degrees()  # Nombre de dépendances non encore planifiées
+    data_ready = array(graph.time_typecode, [0]) * n  # Fin de la dernière dépendance planifiée
+    ready = bytearray(n)
+    versions = [0] * num_hosts  # Nombre d'affectations faites sur chaque hôte
+    # Entrées (fin, tâche, core, hôte, version, début, classe) : version -1 pour un minorant,
+    # classe -1 pour l'entrée propre d'une tâche bloquée (ou de toute tâche avec une matrice ETC)
+    candidates = []
+    by_class = graph.etc is None
+    class_ids = {}  # (durée, mémoire) -> numéro de classe
+    classes = [{} for _ in range(num_hosts)]  # Par hôte : numéro de classe -> tas des tâches débloquées
+    class_entries = [{} for _ in range(num_hosts)]  # Par hôte : numéro de classe -> (version, tâche) en tas
+    blocked = [[] for _ in range(num_hosts)]  # Par hôte : tas (fin des dépendances, tâche) des tâches bloquées
+    
+    def lower_bound(task, h):
+        first_core, pool, _ = hosts[h]
+        if graph.etc is None:
+            task_time = graph.durations[task]
+        else:
+            row = task * graph.num_cores + first_core
+            task_time = min(graph.etc[row:row + cores_per_host])
+        return max(pool.earliest(), data_ready[task]) + task_time
+    
+    def unblock(task, h):
+        key = (graph.durations[task], graph.memories[task])
+        cid = class_ids.setdefault(key, len(class_ids))
+        tasks = classes[h].setdefault(cid, [])
+        heappush(tasks, task)
+        if tasks[0] == task:
+            heappush(candidates, (lower_bound(task, h), task, hosts[h][0], h, -1, 0, cid))
+    
+    def push_ready(task):
+        ready[task] = 1
+        for h in eligible[graph.memories[task]]:
+            if by_class and data_ready[task] <= hosts[h][1].earliest():
+                unblock(task, h)
+            else:
+                if by_class:
+                    heappush(blocked[h], (data_ready[task], task))
+                heappush(candidates, (lower_bound(task, h), task, hosts[h][0], h, -1, 0, -1))
+    
+    # Initialisation : tâches sans prédécesseurs sont prêtes
+    for task in range(n):
+        if remaining_deps[task] == 0:
+            push_ready(task)
+    
+    def pop_best():
+        """ Dépile jusqu'à la première entrée à jour, en réévaluant les entrées périmées """
+        while candidates:
+            entry = heappop(candidates)
+            _, best_task, _, h, version, _, cid = entry
+            if cid < 0:
+                task = best_task
+                if not ready[task] or (by_class and data_ready[task] <= hosts[h][1].earliest()):
+                    continue  # Tâche planifiée, ou débloquée et représentée par sa classe
+            else:
+                tasks = classes[h][cid]
+                while tasks and not ready[tasks[0]]:
+                    heappop(tasks)
+                if not tasks:
+                    continue
+                task = tasks[0]
+                if (versions[h], task) == class_entries[h].get(cid) and (version, best_task) != (versions[h], task):
+                    continue  # Une entrée à jour de la classe est déjà dans le tas
+            if version == versions[h] and best_task == task:
+                return entry
+            m, s, f = _host_assignment(graph, task, data_ready, hosts[h])
+            heappush(candidates, (f, task, m, h, versions[h], s, cid))
+            if cid >= 0:
+                class_entries[h][cid] = (versions[h], task)
+        raise Exception("Aucune tâche prête : le graphe comporte peut-être un cycle.")
+    
+    while len(schedule) < n:
+        # Sélection du meilleur couple (tâche, core), à égalité la plus petite tâche puis le plus petit core
+        best_finish, best_task, best_machine, h, _, best_start, cid = pop_best()
+        
+        # Planification de la tâche sélectionnée et réservation de sa mémoire sur l'hôte
+        first_core, pool, profile = hosts[h]
+        schedule.place(best_task, best_machine, best_start, best_finish)
+        machines.assign(best_machine, best_finish)
+        pool.assign(best_machine - first_core, best_finish)
+        profile.add(best_start, best_finish, graph.memories[best_task])
+        ready[best_task] = 0
+        versions[h] += 1
+        
+        # Aucune tâche ne pourra plus commencer sur l'hôte avant la libération de son premier core
+        earliest = pool.earliest()
+        profile.prune(earliest)
+        if cid >= 0:
+            # L'entrée dépilée était celle de la classe : la tâche suivante de la classe en reçoit une
+            tasks = classes[h][cid]
+            heappop(tasks)
+            while tasks and not ready[tasks[0]]:
+                heappop(tasks)
+            if tasks:
+                heappush(candidates, (lower_bound(tasks[0], h), tasks[0], first_core, h, -1, 0, cid))
+        waiting = blocked[h]
+        while waiting and waiting[0][0] <= earliest:
+            _, task = heappop(waiting)
+            if ready[task]:
+                unblock(task, h)
+        
+        # Mise à jour incrémentale des tâches prêtes pour les successeurs de la tâche planifiée
+        newly_ready = set()
+        update_ready_tasks(graph, newly_ready, remaining_deps, data_ready, best_task, best_finish)
+        for task in newly_ready:
+            push_ready(task)
+
+ENGINES = {
+    "scan": _min_min_scan,
+    "heap": _min_min_heap,
+    "numpy": _min_min_numpy,
+}
+
+def min_min_schedule(G, num_machines, engine="heap", memory_limits=None, cores_per_host=1):
+    """
+    Implémente l'algorithme Min-Min pour le scheduling sur num_machines machines en utilisant une approche
+    incrémentale pour ne recalculer que les tâches potentiellement prêtes.
+    
+    G peut être un TaskGraph compilé ou un DiGraph NetworkX (compilé à la volée). L'ordonnancement travaille
+    uniquement sur les indices entiers ; à complétion égale, la tâche de plus petit indice est choisie.
+    engine choisit le moteur ("heap" par défaut, "scan" pour le parcours exhaustif de référence, "numpy"
+    pour l'évaluation vectorisée des fronts très larges) : tous produisent le même planning.
+    
+    Si le graphe décrit des cores hétérogènes (matrice ETC), num_machines doit correspondre au nombre de
+    cores décrits ; le tas supposant des cores identiques, "heap" passe alors par l'évaluation vectorisée.
+    
+    memory_limits active le mode à mémoire contrainte (attribut "memory" des tâches) : les cores sont
+    regroupés en hôtes de cores_per_host cores, et memory_limits donne la capacité de chaque hôte (liste)
+    ou de tous les hôtes (nombre). Avec cores_per_host=1, ce sont des limites par core. engine est alors ignoré.
+    
+    Si les dépendances ont des coûts de communication, seul le parcours exhaustif sait les prendre en compte :
+    engine est ignoré et le moteur "scan" est utilisé (dates de disponibilité par core mises en cache).
+    
+    Retourne le planning ainsi que le makespan global. Le planning est un CompiledSchedule si G est un
+    TaskGraph, et un dictionnaire { tâche: (machine, start_time, finish_time) } si G est un DiGraph.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur d'ordonnancement inconnu : {engine} (choix possibles : {', '.join(ENGINES)})")
+    graph = G if isinstance(G, TaskGraph) else TaskGraph.from_networkx(G)
+    if graph.etc is not None:
+        if graph.num_cores != num_machines:
+            raise ValueError(f"Le graphe décrit {graph.num_cores} cores mais num_machines vaut {num_machines}")
+        if engine == "heap":
+            engine = "numpy"
+    if graph.pred_costs is not None:
+        if memory_limits is not None:
+            raise ValueError("Le mode à mémoire contrainte ne prend pas en compte les coûts de communication")
+        engine = "scan"
+    
+    machines = MachinePool(num_machines)  # Temps de disponibilité de chaque machine
+    schedule = CompiledSchedule.empty(graph)
+    if memory_limits is None:
+        ENGINES[engine](graph, machines, schedule)
+    else:
+        if num_machines % cores_per_host:
+            raise ValueError(f"num_machines ({num_machines}) n'est pas un multiple de cores_per_host ({cores_per_host})")
+        num_hosts = num_machines // cores_per_host
+        if not isinstance(memory_limits, (list, tuple)):
+            memory_limits = [memory_limits] * num_hosts
+        if len(memory_limits) != num_hosts:
+            raise ValueError(f"memory_limits décrit {len(memory_limits)} hôtes au lieu de {num_hosts}")
+        _min_min_memory(graph, machines, schedule, memory_limits, cores_per_host)
+    
+    makespan = machines.makespan()
+    if graph is not G:
+        # Appel historique sur un DiGraph : on restitue le planning indexé par identifiant
+        return schedule.to_dict(), makespan
     return schedule, makespan
 
 def convert_schedule_to_json(schedule, num_machines):
     """
     Convertit le planning calculé au format JSON souhaité.
+    Le planning peut être un dictionnaire ou un CompiledSchedule : c'est ici seulement que les
+    identifiants d'origine des tâches sont restitués.
     
     Format final :
     {
@@ -135,4 +713,36 @@ def convert_schedule_to_json(schedule, num_machines):
     # Tri des tâches sur chaque core par ordre croissant de start_time
     for core in final_schedule:
         final_schedule[core] = sorted(final_schedule[core], key=lambda x: x["start_time"])
-    return final_schedule
\ No newline at end of file
+    return final_schedule
+
+def convert_schedule_to_columns(schedule, num_machines):
+    """
+    Convertit le planning calculé au format JSON en colonnes, bien plus compact que convert_schedule_to_json
+    (ni un objet par tâche, ni identifiant répété) : les tâches sont désignées par leur indice dans "ids".
+    
+    Format :
+    {
+      "format": "columnar",
+      "ids": ["task1", "task2", ...],
+      "cores": {
+        "core_0": {"tasks": [0, ...], "start_time": [0, ...], "finish_time": [9, ...]},
+        ...
+      }
+    }
+    Sur chaque core, les tâches sont rangées par ordre croissant de start_time.
+    """
+    if isinstance(schedule, CompiledSchedule):
+        ids = schedule.graph.ids
+        tasks, starts, finishes = schedule.columns(num_machines)
+        cores = {f"core_{m}": {"tasks": tasks[m].tolist(),
+                               "start_time": starts[m].tolist(),
+                               "finish_time": finishes[m].tolist()} for m in range(num_machines)}
+    else:
+        ids = list(schedule)
+        cores = {f"core_{m}": {"tasks": [], "start_time": [], "finish_time": []} for m in range(num_machines)}
+        for i, (machine, start, finish) in sorted(enumerate(schedule.values()), key=lambda x: x[1][1]):
+            core = cores[f"core_{machine}"]
+            core["tasks"].append(i)
+            core["start_time"].append(start)
+            core["finish_time"].append(finish)
+    return {"format": "columnar", "ids": list(ids), "cores": cores}
@@ -0,0 +1,131 @@
+# Champs d'un nœud de l'arbre : [add, high, low, left, right]
+ADD, HIGH, LOW, LEFT, RIGHT = range(5)
+
+
+def _midpoint(lo, hi):
+    """ Milieu de [lo, hi) : entier tant que l'intervalle dépasse une unité, pour que des dates entières le restent """
+    return (lo + hi) // 2 if hi - lo > 1 else (lo + hi) / 2
+
+def _leaf(value):
+    return [value, value, value, None, None]
+
+
+class ResourceProfile:
+    """
+    Profil d'utilisation d'une ressource (la mémoire d'un hôte) au cours du temps, rangé dans un arbre
+    de segments dynamique sur l'axe des temps [0, end) : chaque nœud couvre un intervalle, coupé en son
+    milieu, et n'a de fils que si une réservation commence ou finit à l'intérieur. end double à la demande ;
+    au-delà, la consommation est nulle.
+
+    Un nœud porte add, la consommation ajoutée sur tout son intervalle (marque permanente, jamais
+    propagée aux fils), et high / low, le maximum et le minimum de la consommation sur son intervalle
+    en comptant add mais pas les marques de ses ancêtres.
+
+    - add(start, end, amount) : ajout sur un intervalle, en O(log T)
+    - earliest_fit(t, duration, amount) : descentes sur high (premier instant saturé de la fenêtre)
+      et low (premier instant où la tâche tient de nouveau), en O(log T) par intervalle saturé franchi
+    - prune(t) : remplace par des feuilles les sous-arbres antérieurs à t, en O(log T)
+    T est l'étendue de l'axe des temps rapportée au plus petit écart entre deux points de rupture.
+    """
+
+    __slots__ = ("capacity", "end", "root")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.end = 1
+        self.root = _leaf(0)
+
+    def _grow(self, t):
+        """ Double l'intervalle couvert jusqu'à contenir t : l'ancienne racine devient le fils gauche """
+        while t > self.end:
+            root = self.root
+            self.root = [0, max(root[HIGH], 0), min(root[LOW], 0), root, _leaf(0)]
+            self.end *= 2
+
+    def _add(self, node, lo, hi, start, end, amount):
+        if start <= lo and hi <= end:
+            node[ADD] += amount
+            node[HIGH] += amount
+            node[LOW] += amount
+            return
+        mid = _midpoint(lo, hi)
+        if node[LEFT] is None:
+            node[LEFT] = _leaf(0)
+            node[RIGHT] = _leaf(0)
+        left, right = node[LEFT], node[RIGHT]
+        if start < mid:
+            self._add(left, lo, mid, start, end, amount)
+        if end > mid:
+            self._add(right, mid, hi, start, end, amount)
+        node[HIGH] = node[ADD] + max(left[HIGH], right[HIGH])
+        node[LOW] = node[ADD] + min(left[LOW], right[LOW])
+
+    def add(self, start, end, amount):
+        """ Réserve amount sur l'intervalle [start, end) """
+        if end <= start:
+            return
+        self._grow(end)
+        self._add(self.root, 0, self.end, start, end, amount)
+
+    def _first_above(self, node, lo, hi, start, end, limit, acc):
+        """ Premier instant de [start, end) où la consommation dépasse limit (None si aucun) """
+        if end <= lo or hi <= start or acc + node[HIGH] <= limit:
+            return None
+        if node[LEFT] is None:
+            return max(lo, start)
+        acc += node[ADD]
+        mid = _midpoint(lo, hi)
+        t = self._first_above(node[LEFT], lo, mid, start, end, limit, acc)
+        if t is None:
+            t = self._first_above(node[RIGHT], mid, hi, start, end, limit, acc)
+        return t
+
+    def _first_at_most(self, node, lo, hi, start, limit, acc):
+        """ Premier instant >= start où la consommation est au plus limit (None si aucun avant hi) """
+        if hi <= start or acc + node[LOW] > limit:
+            return None
+        if node[LEFT] is None:
+            return max(lo, start)
+        acc += node[ADD]
+        mid = _midpoint(lo, hi)
+        t = self._first_at_most(node[LEFT], lo, mid, start, limit, acc)
+        if t is None:
+            t = self._first_at_most(node[RIGHT], mid, hi, start, limit, acc)
+        return t
+
+    def earliest_fit(self, t, duration, amount):
+        """
+        Plus petite date de début >= t telle que la consommation reste <= capacity sur toute
+        la durée de la tâche, en comptant amount en plus de la consommation existante.
+        """
+        if duration <= 0:
+            return t
+        limit = self.capacity - amount
+        if limit < 0:
+            raise ValueError(f"Consommation de {amount} impossible à satisfaire (capacité {self.capacity})")
+        while True:
+            conflict = self._first_above(self.root, 0, self.end, t, t + duration, limit, 0)
+            if conflict is None:
+                return t
+            # On retente au premier instant qui suit le conflit où la tâche tient (au pire après end)
+            t = self._first_at_most(self.root, 0, self.end, conflict, limit, 0)
+            if t is None:
+                t = self.end
+
+    def prune(self, t):
+        """ Oublie le détail du profil avant la date t (aucune tâche ne commencera plus tôt) """
+        path = []
+        node, lo, hi = self.root, 0, self.end
+        while node[LEFT] is not None:
+            path.append(node)
+            mid = _midpoint(lo, hi)
+            if t >= mid:
+                # Le fils gauche est entièrement passé : une feuille dont la valeur ne change pas les extrema
+                node[LEFT] = _leaf(node[RIGHT][LOW])
+                node, lo = node[RIGHT], mid
+            else:
+                node, hi = node[LEFT], mid
+        for node in reversed(path):
+            left, right = node[LEFT], node[RIGHT]
+            node[HIGH] = node[ADD] + max(left[HIGH], right[HIGH])
+            node[LOW] = node[ADD] + min(left[LOW], right[LOW])
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from collections import OrderedDict
+from utilities import read_from_bucket, write_json_to_bucket
+from storage import get_storage
+
+CACHE_VERSION = 3  # À incrémenter si l'algorithme ou le format du planning change
+
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+def graph_digest(input_key, storage=None, chunk_size=1 << 20):
+    """
+    Empreinte SHA-256 d'un graphe : celle du contenu brut de l'objet input_key, tel qu'il est stocké (lu
+    en flux, sans décompression ni analyse du JSON). Elle se calcule bien plus vite que la compilation du
+    graphe, qui n'a donc lieu qu'en cas d'échec du cache. En-tête (core_speeds, bandwidth...) et ordre
+    des tâches (qui départage les égalités de l'ordonnanceur) font partie du contenu haché.
+    storage : stockage où lire le graphe (voir storage.get_storage).
+    """
+    digest = hashlib.sha256()
+    raw, _ = get_storage(storage).open_raw(input_key)
+    with raw as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def schedule_cache_key(digest, num_machines, **params):
+    """
+    Clé de cache d'un ordonnancement : empreinte SHA-256 de l'empreinte du graphe (graph_digest) et des
+    paramètres de l'ordonnanceur.
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "num_machines": num_machines,
+        "params": params,
+        "graph": digest,
+    }
+    return hashlib.sha256(_CANONICAL_JSON.encode(payload).encode("utf-8")).hexdigest()
+
+class ScheduleCache:
+    """
+    Cache des plannings à deux niveaux :
+      - un LRU en mémoire, conservé d'une invocation à l'autre tant que le conteneur Lambda reste chaud ;
+      - le bucket, sous prefix (un objet <prefix><clé>.json par planning), partagé par tous les conteneurs.
+        Sans prefix, c'est le préfixe du cache du stockage (storage.cache_prefix) qui est utilisé.
+    """
+
+    def __init__(self, max_entries=16, prefix=None):
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.entries = OrderedDict()
+
+    def _object_key(self, key, storage):
+        return (self.prefix or storage.cache_prefix) + key + ".json"
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key, storage=None):
+        """
+        Retourne (final_schedule, makespan), ou None si l'ordonnancement n'a jamais été calculé
+        (storage : stockage du cache, voir storage.get_storage)
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        try:
+            storage = get_storage(storage)
+            stored = json.loads(read_from_bucket(self._object_key(key, storage), storage))
+        except Exception:  # Objet absent (ou illisible) : on recalculera le planning
+            return None
+
+        value = (stored["schedule"], stored["makespan"])
+        self._remember(key, value)
+        return value
+
+    def put(self, key, final_schedule, makespan, storage=None):
+        """ Enregistre un planning dans les deux niveaux du cache """
+        self._remember(key, (final_schedule, makespan))
+
+        storage = get_storage(storage)
+        write_json_to_bucket({"schedule": final_schedule, "makespan": makespan}, self._object_key(key, storage), storage)
@@ -1,8 +1,8 @@
 import time
-import networkx as nx
 from min_min import min_min_schedule
 from utilities import generate_task_graph
-from memory_profiler import memory_usage
+from graph_families import GRAPH_FAMILIES, generate_family_graph, graph_shape
+from lazy_imports import lazy_import
 
 def measure_time_vs_N(machines, N_values):
     """
@@ -11,7 +11,7 @@ def measure_time_vs_N(machines, N_values):
     """
     times = []
     for n in N_values:
-        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5)
+        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5, as_networkx=False)
         start = time.time()
         schedule, makespan = min_min_schedule(G, machines)
         end = time.time()
@@ -25,7 +25,7 @@ def measure_time_vs_M(num_tasks, M_values):
     """
     times = []
     # Générer un graphe fixe pour un nombre donné de tâches
-    G, _, _, _ = generate_task_graph(num_tasks=num_tasks, max_dependencies=5)
+    G, _, _, _ = generate_task_graph(num_tasks=num_tasks, max_dependencies=5, as_networkx=False)
     for m in M_values:
         start = time.time()
         schedule, makespan = min_min_schedule(G, m)
@@ -41,9 +41,9 @@ def measure_memory_vs_N(machines, N_values):
     """
     peak_memories = []
     for n in N_values:
-        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5)
+        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5, as_networkx=False)
         # Mesurer la consommation mémoire pendant l'exécution de min_min_schedule 
-        mem_usage = memory_usage((min_min_schedule, (G, machines)), interval=0.1)
+        mem_usage = lazy_import("memory_profiler").memory_usage((min_min_schedule, (G, machines)), interval=0.1)
         peak_memory = max(mem_usage)
         peak_memories.append(peak_memory)
     return peak_memories
@@ -58,7 +58,7 @@ def measure_time_and_memory_vs_N(machines, N_values):
     times = []
     peak_memories = []
     for n in N_values:
-        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5)
+        G, _, _, _ = generate_task_graph(num_tasks=n, max_dependencies=5, as_networkx=False)
         
         # Calcul du temps que prend l'exécution de l'algorithme d'ordonnancement
         start = time.time()
@@ -68,7 +68,27 @@ def measure_time_and_memory_vs_N(machines, N_values):
         times.append(exec_time)
         
         # Mesure de l'utilisation mémoire de l'algorithme d'ordonnancement
-        mem_usage = memory_usage((min_min_schedule, (G, machines)), interval=0.1)
+        mem_usage = lazy_import("memory_profiler").memory_usage((min_min_schedule, (G, machines)), interval=0.1)
         peak_memory = max(mem_usage)
         peak_memories.append(peak_memory)
-    return times, peak_memories
\ No newline at end of file
+    return times, peak_memories
+
+def measure_time_vs_family(machines, num_tasks, families=("random",) + GRAPH_FAMILIES, width=None, fan=None):
+    """
+    Mesure le temps d'exécution de l'algorithme sur des graphes de même taille mais de formes différentes
+    (tirage aléatoire et familles de graph_families), pour un nombre fixe de machines.
+    Retourne les temps et la forme de chaque graphe (profondeur, largeur maximale..., voir graph_shape).
+    """
+    times = []
+    shapes = []
+    for family in families:
+        if family == "random":
+            G, _, _, _ = generate_task_graph(num_tasks=num_tasks, max_dependencies=5, as_networkx=False)
+        else:
+            G, _, _ = generate_family_graph(family, num_tasks, width=width, fan=fan)
+        start = time.time()
+        schedule, makespan = min_min_schedule(G, machines)
+        end = time.time()
+        times.append(end - start)
+        shapes.append(graph_shape(G))
+    return times, shapes
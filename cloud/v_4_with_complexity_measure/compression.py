@@ -0,0 +1,98 @@
+import gzip
+import zlib
+from lazy_imports import lazy_import
+
+# Compression des objets du bucket, reconnue (dans cet ordre) à l'en-tête Content-Encoding, à l'extension
+# de la clé ou aux premiers octets de l'objet. Compression et décompression se font au fil de l'eau.
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+COMPRESSION_MAGICS = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+_MAGIC_SIZE = max(len(magic) for magic in COMPRESSION_MAGICS)
+
+
+class PrefixedStream:
+    """ Flux binaire qui rend d'abord prefix (octets déjà lus pour identifier le format), puis la suite de stream """
+
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size=-1):
+        if not self.prefix:
+            return self.stream.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.stream.read(), b""
+        elif size > len(self.prefix):
+            data, self.prefix = self.prefix + self.stream.read(size - len(self.prefix)), b""
+        else:
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+        return data
+
+    def close(self):
+        self.stream.close()
+
+
+def encoding_from_key(key):
+    """ Compression désignée par l'extension de la clé ("gzip", "zstd"), ou None """
+    for suffix, encoding in COMPRESSION_SUFFIXES.items():
+        if key.endswith(suffix):
+            return encoding
+    return None
+
+def key_with_encoding(key, encoding):
+    """ key complétée de l'extension de la compression encoding ("gzip", "zstd" ; None : key inchangée) """
+    if encoding is None:
+        return key
+    _check_encoding(encoding)
+    suffix = next(suffix for suffix, name in COMPRESSION_SUFFIXES.items() if name == encoding)
+    return key if key.endswith(suffix) else key + suffix
+
+def encoding_from_magic(data):
+    """ Compression reconnue aux premiers octets data, ou None """
+    for magic, encoding in COMPRESSION_MAGICS.items():
+        if data.startswith(magic):
+            return encoding
+    return None
+
+def _zstandard():
+    """ Module zstandard, importé au premier objet zstd rencontré """
+    try:
+        return lazy_import("zstandard")
+    except ImportError:  # zstandard n'est pas fourni par la couche Lambda : seul gzip est alors disponible
+        raise ValueError("La compression zstd nécessite le paquet zstandard")
+
+def _check_encoding(encoding):
+    if encoding not in ("gzip", "zstd"):
+        raise ValueError(f"Compression inconnue : {encoding}")
+
+def decoding_stream(stream, key, content_encoding=None):
+    """
+    Flux décompressé d'un objet (stream : flux binaire brut). Sans Content-Encoding ni extension connue,
+    les premiers octets sont examinés ; un objet non compressé est rendu tel quel.
+    """
+    encoding = content_encoding if content_encoding in ("gzip", "zstd") else encoding_from_key(key)
+    if encoding is None:
+        head = stream.read(_MAGIC_SIZE)
+        encoding = encoding_from_magic(head)
+        stream = PrefixedStream(head, stream)
+        if encoding is None:
+            return stream
+    _check_encoding(encoding)
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return _zstandard().ZstdDecompressor().stream_reader(stream, read_across_frames=True, closefd=False)
+
+def encode_chunks(chunks, encoding):
+    """ Compresse au fil de l'eau un itérable de bytes (encoding : "gzip", "zstd" ou None pour ne rien faire) """
+    if encoding is None:
+        yield from chunks
+        return
+    _check_encoding(encoding)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits = 16 + 15 : en-tête et contrôle gzip
+    else:
+        compressor = _zstandard().ZstdCompressor().compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
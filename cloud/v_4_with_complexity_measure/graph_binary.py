@@ -0,0 +1,193 @@
+import json
+import struct
+import sys
+from array import array
+from task_graph import TaskGraph, typecode_of
+from compression import COMPRESSION_SUFFIXES
+
+# Format binaire d'un TaskGraph (petit-boutiste), chargé sans analyse : les tableaux du graphe compilé
+# sont des vues (memoryview) directement posées sur le fichier projeté en mémoire (mmap) ou sur l'objet lu.
+#
+#   en-tête fixe   BINARY_MAGIC, version, drapeaux, nombre de nœuds, d'arcs, de cores, taille des métadonnées
+#   métadonnées    JSON UTF-8 {"header": {...}, "ids": [...]} (table des identifiants internés)
+#   tableaux       durations, memories (N), pred_offsets (N+1), pred_indices (E), succ_offsets (N+1),
+#                  succ_indices (E), puis etc (N x cores) et pred_costs (E) s'ils existent
+#
+# Chaque section commence sur un multiple de 8 octets ; les entiers sont sur 8 octets ('q'), sauf les
+# indices des CSR (4 octets, 'i'), et les drapeaux indiquent les tableaux stockés en flottants ('d').
+
+BINARY_MAGIC = b"\x89TGRAPH\n"  # Commence par un octet non ASCII : ne peut pas être confondu avec du JSON
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".tgb"
+
+_HEADER = struct.Struct("<8sIIqqqq")
+
+_FLOAT_DURATIONS = 1
+_FLOAT_MEMORIES = 2
+_HAS_ETC = 4
+_FLOAT_ETC = 8
+_HAS_COSTS = 16
+_FLOAT_COSTS = 32
+
+
+def is_binary_graph_key(key):
+    """ Vrai si la clé désigne un graphe au format binaire (d'après son extension, compression exclue) """
+    for suffix in COMPRESSION_SUFFIXES:
+        if key.endswith(suffix):
+            key = key[:-len(suffix)]
+    return key.endswith(BINARY_SUFFIX)
+
+def _padding(size):
+    return b"\0" * (-size % 8)
+
+def _little_endian(values):
+    """ Octets petit-boutistes d'un tableau typé (ou d'une vue) """
+    if sys.byteorder == "little":
+        return memoryview(values).cast("B")
+    swapped = array(typecode_of(values), values)
+    swapped.byteswap()
+    return memoryview(swapped).cast("B")
+
+class _Sections:
+    """ Lecture, dans l'ordre, des sections alignées sur 8 octets d'un tampon binaire """
+
+    def __init__(self, view, offset, truncated_message):
+        self.view = view
+        self.offset = offset
+        self.truncated_message = truncated_message
+
+    def raw(self, size):
+        """ Section de size octets (bytes) """
+        if self.offset + size > len(self.view):
+            raise ValueError(self.truncated_message)
+        data = bytes(self.view[self.offset:self.offset + size])
+        self.offset += size + (-size % 8)
+        return data
+
+    def take(self, typecode, length):
+        """ Section de length éléments de type typecode, en vue sur le tampon (sans copie) """
+        size = 8 * length if typecode in "qd" else 4 * length
+        if self.offset + size > len(self.view):
+            raise ValueError(self.truncated_message)
+        values = self.view[self.offset:self.offset + size].cast(typecode)
+        self.offset += size + (-size % 8)
+        if sys.byteorder != "little":
+            values = array(typecode, values)
+            values.byteswap()
+        return values
+
+def dump_task_graph(graph, header=None):
+    """
+    Produit, morceau par morceau (bytes), la forme binaire du graphe compilé.
+    header : métadonnées JSON à conserver avec le graphe (graph_id, random_seed...).
+    """
+    flags = 0
+    if typecode_of(graph.durations) == "d":
+        flags |= _FLOAT_DURATIONS
+    if typecode_of(graph.memories) == "d":
+        flags |= _FLOAT_MEMORIES
+    arrays = [graph.durations, graph.memories, graph.pred_offsets, graph.pred_indices,
+              graph.succ_offsets, graph.succ_indices]
+    if graph.etc is not None:
+        flags |= _HAS_ETC | (_FLOAT_ETC if typecode_of(graph.etc) == "d" else 0)
+        arrays.append(graph.etc)
+    if graph.pred_costs is not None:
+        flags |= _HAS_COSTS | (_FLOAT_COSTS if typecode_of(graph.pred_costs) == "d" else 0)
+        arrays.append(graph.pred_costs)
+
+    metadata = json.dumps({"header": header or {}, "ids": graph.ids}, separators=(",", ":")).encode("utf-8")
+    yield _HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(graph), graph.num_edges,
+                       graph.num_cores or 0, len(metadata))
+    yield metadata + _padding(len(metadata))
+    for values in arrays:
+        data = _little_endian(values)
+        yield data
+        yield _padding(len(data))
+
+def load_task_graph(buffer, header=None):
+    """
+    Reconstruit un TaskGraph à partir de sa forme binaire (bytes, mmap...) sans copier les tableaux.
+    Les métadonnées enregistrées avec le graphe sont rangées dans header (si fourni).
+    """
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise ValueError("Graphe binaire tronqué")
+    magic, version, flags, n, num_edges, num_cores, metadata_size = _HEADER.unpack_from(view)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Ce n'est pas un graphe au format binaire")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Version {version} du format binaire non prise en charge")
+
+    sections = _Sections(view, _HEADER.size, "Graphe binaire tronqué")
+    metadata = json.loads(sections.raw(metadata_size))
+    if header is not None:
+        header.update(metadata["header"])
+
+    durations = sections.take("d" if flags & _FLOAT_DURATIONS else "q", n)
+    memories = sections.take("d" if flags & _FLOAT_MEMORIES else "q", n)
+    pred_offsets = sections.take("q", n + 1)
+    pred_indices = sections.take("i", num_edges)
+    succ_offsets = sections.take("q", n + 1)
+    succ_indices = sections.take("i", num_edges)
+    etc = sections.take("d" if flags & _FLOAT_ETC else "q", n * num_cores) if flags & _HAS_ETC else None
+    pred_costs = sections.take("d" if flags & _FLOAT_COSTS else "q", num_edges) if flags & _HAS_COSTS else None
+    return TaskGraph(metadata["ids"], durations, memories, pred_offsets, pred_indices, succ_offsets, succ_indices,
+                     etc, num_cores if etc is not None else None, pred_costs)
+
+
+# Format binaire d'un planning en colonnes (voir min_min.convert_schedule_to_columns) :
+#
+#   en-tête fixe   SCHEDULE_MAGIC, version, drapeaux, nombre de cores, nombre de tâches, taille de la table des ids
+#   table des ids  JSON UTF-8 ["task1", ...]
+#   par core       nombre de tâches (8 octets), indices des tâches ('i'), dates de début puis de fin
+#
+# avec les mêmes conventions que le format des graphes (petit-boutiste, sections alignées sur 8 octets).
+
+SCHEDULE_MAGIC = b"\x89TSCHED\n"
+SCHEDULE_VERSION = 1
+SCHEDULE_SUFFIX = ".tsb"
+
+_SCHEDULE_HEADER = struct.Struct("<8sIIqqq")
+_FLOAT_TIMES = 1
+
+
+def dump_schedule_columns(columns):
+    """ Produit, morceau par morceau (bytes), la forme binaire d'un planning en colonnes """
+    cores = list(columns["cores"].values())
+    times_float = any(isinstance(value, float) for core in cores for value in core["finish_time"])
+    time_typecode = "d" if times_float else "q"
+
+    ids = json.dumps(columns["ids"], separators=(",", ":")).encode("utf-8")
+    yield _SCHEDULE_HEADER.pack(SCHEDULE_MAGIC, SCHEDULE_VERSION, _FLOAT_TIMES if times_float else 0,
+                                len(cores), len(columns["ids"]), len(ids))
+    yield ids + _padding(len(ids))
+    for core in cores:
+        yield struct.pack("<q", len(core["tasks"]))
+        for typecode, values in (("i", core["tasks"]), (time_typecode, core["start_time"]),
+                                 (time_typecode, core["finish_time"])):
+            data = _little_endian(array(typecode, values))
+            yield data
+            yield _padding(len(data))
+
+def load_schedule_columns(buffer):
+    """ Relit un planning binaire : même structure que convert_schedule_to_columns, avec des vues typées """
+    view = memoryview(buffer)
+    if len(view) < _SCHEDULE_HEADER.size:
+        raise ValueError("Planning binaire tronqué")
+    magic, version, flags, num_cores, num_tasks, ids_size = _SCHEDULE_HEADER.unpack_from(view)
+    if magic != SCHEDULE_MAGIC:
+        raise ValueError("Ce n'est pas un planning au format binaire")
+    if version != SCHEDULE_VERSION:
+        raise ValueError(f"Version {version} du format binaire non prise en charge")
+
+    sections = _Sections(view, _SCHEDULE_HEADER.size, "Planning binaire tronqué")
+    ids = json.loads(sections.raw(ids_size))
+    time_typecode = "d" if flags & _FLOAT_TIMES else "q"
+
+    cores = {}
+    for m in range(num_cores):
+        count = sections.take("q", 1)[0]
+        cores[f"core_{m}"] = {"tasks": sections.take("i", count),
+                              "start_time": sections.take(time_typecode, count),
+                              "finish_time": sections.take(time_typecode, count)}
+    return {"format": "columnar", "ids": ids, "cores": cores}
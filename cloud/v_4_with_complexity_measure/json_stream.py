@@ -0,0 +1,117 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _JsonStreamReader:
+    """
+    Lecture incrémentale d'un document JSON depuis un flux (fichier ouvert, corps d'une réponse S3...) :
+    seule la portion en cours d'analyse est gardée en mémoire. read() peut rendre des octets (décodés
+    en UTF-8 au fil de l'eau) ou du texte.
+    """
+
+    def __init__(self, stream, chunk_size=1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """
+        Ajoute un morceau du flux au tampon (au moins autant que ce qui est en attente : coût amorti linéaire).
+        Seule une lecture vide marque la fin du flux : une lecture courte peut s'arrêter au milieu d'un caractère
+        UTF-8, que le décodeur garde alors sans rien rendre, et on continue de lire.
+        """
+        if self.eof:
+            raise ValueError("Fin prématurée du document JSON")
+        size = max(self.chunk_size, len(self.buffer) - self.pos)
+        text = ""
+        while not text and not self.eof:
+            chunk = self.stream.read(size)
+            if not chunk:
+                self.eof = True
+            if isinstance(chunk, bytes):
+                text = self.decoder.decode(chunk, final=self.eof)
+            else:
+                text = chunk
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+
+    def peek(self):
+        """ Prochain caractère significatif (hors blancs), sans le consommer """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self._fill()
+
+    def next_char(self):
+        c = self.peek()
+        self.pos += 1
+        return c
+
+    def expect(self, expected):
+        c = self.next_char()
+        if c != expected:
+            raise ValueError(f"JSON invalide : '{expected}' attendu, '{c}' trouvé")
+
+    def value(self):
+        """ Décode la prochaine valeur JSON complète """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # Un nombre en fin de tampon peut être tronqué : on n'accepte que si la suite est connue
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_tasks(stream, header=None):
+    """
+    Parcourt un fichier de graphe JSON ({"tasks": [...], ...}) et produit les tâches une par une, sans
+    charger le document entier. Les autres clés de premier niveau (graph_id, core_speeds, bandwidth...)
+    sont rangées dans header (si fourni) ; celles qui suivent "tasks" n'y sont qu'une fois les tâches épuisées.
+    Lève ValueError si l'objet n'a pas de tableau "tasks".
+    """
+    if header is None:
+        header = {}
+    reader = _JsonStreamReader(stream)
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise ValueError("Graphe JSON invalide : pas de tableau \"tasks\"")
+    has_tasks = False
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "tasks":
+            has_tasks = True
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.next_char()
+            else:
+                while True:
+                    yield reader.value()
+                    c = reader.next_char()
+                    if c == "]":
+                        break
+                    if c != ",":
+                        raise ValueError(f"JSON invalide : ',' ou ']' attendu, '{c}' trouvé")
+        else:
+            header[key] = reader.value()
+        c = reader.next_char()
+        if c == "}":
+            break
+        if c != ",":
+            raise ValueError(f"JSON invalide : ',' ou '}}' attendu, '{c}' trouvé")
+    if not has_tasks:
+        raise ValueError("Graphe JSON invalide : pas de tableau \"tasks\"")
@@ -1,8 +1,11 @@
-import networkx as nx
+import time
+_IMPORT_START = time.perf_counter()  # Mesure du coût des imports du handler (démarrage à froid)
 import json
 from min_min import read_graphe, min_min_schedule, convert_schedule_to_json
 from utilities import *
 from complexity_measures import *
+from lazy_imports import import_report
+HANDLER_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
 
 def lambda_handler(event, context):
     try:
@@ -11,10 +14,14 @@ def lambda_handler(event, context):
             "measure_time_vs_N": True,
             "measure_time_vs_M": True,
             "measure_memory_vs_N": True,
+            "measure_time_vs_family": True,
             "num_tasks_range": [100, 3100, 100],  # [start, stop, step]
             "machines_range": [1, 70, 3],  # [start, stop, step]
             "fixed_machines": 2,
-            "fixed_tasks": 1000
+            "fixed_tasks": 1000,
+            "families": ["random", *GRAPH_FAMILIES],
+            "family_width": None,  # Largeur des couches, étapes ou nombre de chaînes (par défaut racine carrée de fixed_tasks)
+            "family_fan": None  # Nombre de parents (couches) ou de fils (arbres) d'une tâche (2 par défaut)
         }
 
         # Initialiser les paramètres manquants dans l'événement
@@ -49,6 +56,14 @@ def lambda_handler(event, context):
             peak_memories = measure_memory_vs_N(machines=event["fixed_machines"], N_values=N_values)
             results["memory_vs_N"] = {"N_values": N_values, "peak_memories": peak_memories, "fixed_machines": event["fixed_machines"]}
 
+        # Mesurer le temps en fonction de la forme du graphe (à nombre de tâches et de machines fixés)
+        if event["measure_time_vs_family"]:
+            times, shapes = measure_time_vs_family(machines=event["fixed_machines"], num_tasks=event["fixed_tasks"],
+                                                   families=event["families"], width=event["family_width"], fan=event["family_fan"])
+            results["time_vs_family"] = {"families": event["families"], "times": times, "shapes": shapes,
+                                         "fixed_tasks": event["fixed_tasks"], "fixed_machines": event["fixed_machines"]}
+
+        results["import_report"] = import_report(HANDLER_IMPORT_SECONDS)
         return results
 
     except Exception as e:
@@ -0,0 +1,33 @@
+import importlib
+import sys
+import time
+
+# Durée (en secondes) des imports différés effectués par ce processus, par module
+_IMPORT_TIMES = {}
+_cold_start = True
+
+def lazy_import(name):
+    """
+    Importe le module name à sa première utilisation plutôt qu'au chargement du handler (networkx, numpy,
+    boto3, memory_profiler... ne sont pas nécessaires à tous les modes), en mesurant la durée de l'import.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+def import_report(handler_import_seconds):
+    """
+    Rapport des imports à joindre à la réponse du handler, pour suivre le coût du démarrage à froid :
+    durée des imports du module du handler, durée de chaque import différé fait par ce processus (en ms),
+    et si l'invocation est la première du conteneur.
+    """
+    global _cold_start
+    report = {"cold_start": _cold_start,
+              "handler_imports_ms": round(handler_import_seconds * 1000, 3),
+              "lazy_imports_ms": {name: round(seconds * 1000, 3) for name, seconds in _IMPORT_TIMES.items()}}
+    _cold_start = False
+    return report
@@ -0,0 +1,241 @@
+import contextlib
+import io
+import itertools
+import mmap
+import os
+from lazy_imports import lazy_import
+from compression import decoding_stream, encode_chunks, encoding_from_key, encoding_from_magic
+
+DEFAULT_BUCKET_NAME = "central-supelec-data-groupe1"
+DEFAULT_GRAPH_PREFIX = "output_data/"
+DEFAULT_CACHE_PREFIX = "cache/"
+
+# Au-delà de cette taille, un objet est téléversé en plusieurs parties (upload_fileobj) plutôt qu'en un put_object
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+
+# Paramètres de stockage d'un événement, et variable d'environnement qui en tient lieu à défaut (voir resolve_storage)
+STORAGE_EVENT_KEYS = {
+    "bucket_name": "BUCKET_NAME",          # Bucket (ou sous-dossier de LOCAL_BUCKET_DIR) utilisé par défaut
+    "local_bucket_dir": "LOCAL_BUCKET_DIR",  # Dossier local qui remplace S3 (exécution hors AWS)
+    "graph_prefix": "GRAPH_PREFIX",        # Préfixe des graphes générés
+    "cache_prefix": "CACHE_PREFIX",        # Préfixe du cache des plannings
+}
+
+# Client S3 partagé par tous les stockages : créé à la première utilisation puis réutilisé (avec ses connexions
+# ouvertes) d'une invocation à l'autre tant que le conteneur Lambda reste chaud
+# (boto3 n'est importé qu'à la création du client : une exécution sur un dossier local s'en passe)
+S3_CLIENT_OPTIONS = {"max_pool_connections": 32,  # Un téléversement en plusieurs parties ouvre jusqu'à 10 connexions
+                     "retries": {"max_attempts": 5, "mode": "adaptive"},
+                     "connect_timeout": 5,
+                     "read_timeout": 60}
+_s3_client = None
+_s3_client_pid = None
+
+def get_s3_client():
+    """
+    Retourne le client S3 partagé, créé au premier appel. Un processus fils (parallel_map) crée le sien :
+    les connexions héritées du parent ne doivent pas être partagées entre processus.
+    """
+    global _s3_client, _s3_client_pid
+    if _s3_client is None or (_s3_client_pid is not None and _s3_client_pid != os.getpid()):
+        config = lazy_import("botocore.config").Config(**S3_CLIENT_OPTIONS)
+        _s3_client = lazy_import("boto3").client('s3', config=config)
+        _s3_client_pid = os.getpid()
+    return _s3_client
+
+def set_s3_client(client):
+    """
+    Remplace le client S3 partagé, par exemple par un faux client pour mesurer les helpers hors ligne
+    (il est alors aussi utilisé par les processus fils). set_s3_client(None) revient au client par défaut.
+    """
+    global _s3_client, _s3_client_pid
+    _s3_client = client
+    _s3_client_pid = None
+
+
+class _ChunkStream(io.RawIOBase):
+    """ Flux binaire en lecture au-dessus d'un itérable de bytes (pour upload_fileobj) """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.pending:
+            self.pending = next(self.chunks, None)
+            if self.pending is None:
+                self.pending = b""
+                return 0
+        n = min(len(buffer), len(self.pending))
+        buffer[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+
+class Storage:
+    """
+    Interface commune des stockages d'objets (graphes, plannings, cache), adressés par une clé "a/b/c.json".
+    Les implémentations fournissent open_raw, put, list et head ; open, get et map s'en déduisent.
+
+    La compression est transparente (voir compression.py) : put compresse l'objet si l'extension de la clé
+    le demande (".gz", ".zst"), et open le décompresse au fil de la lecture.
+    """
+
+    def __init__(self, bucket_name, graph_prefix=DEFAULT_GRAPH_PREFIX, cache_prefix=DEFAULT_CACHE_PREFIX):
+        self.bucket_name = bucket_name
+        self.graph_prefix = graph_prefix  # Préfixe des graphes générés
+        self.cache_prefix = cache_prefix  # Préfixe du cache des plannings
+
+    def open_raw(self, key):
+        """ Ouvre l'objet key tel qu'il est stocké : (flux binaire à utiliser dans un bloc with, Content-Encoding) """
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def open(self, key):
+        """ Ouvre l'objet key en lecture binaire, décompressé, et en flux (à utiliser dans un bloc with) """
+        raw, content_encoding = self.open_raw(key)
+        with raw as stream:
+            yield decoding_stream(stream, key, content_encoding)
+
+    def get(self, key):
+        """ Retourne le contenu (bytes) de l'objet key """
+        with self.open(key) as stream:
+            return stream.read()
+
+    def map(self, key):
+        """ Contenu de l'objet key sous forme de tampon, projeté en mémoire (mmap) quand c'est possible """
+        return self.get(key)
+
+    def put(self, key, chunks):
+        """ Écrit l'objet key (compressé selon son extension) à partir d'un itérable de bytes, consommé au fil de l'eau """
+        raise NotImplementedError
+
+    def list(self, prefix=""):
+        """ Clés (triées) des objets qui commencent par prefix, hors pseudo-dossiers """
+        raise NotImplementedError
+
+    def head(self, key):
+        """ Métadonnées de l'objet key ({"size": ...}), ou None s'il n'existe pas """
+        raise NotImplementedError
+
+
+class S3Storage(Storage):
+    """ Objets d'un bucket S3, via le client partagé """
+
+    def open_raw(self, key):
+        response = get_s3_client().get_object(Bucket=self.bucket_name, Key=key)
+        return contextlib.closing(response["Body"]), response.get("ContentEncoding")
+
+    def put(self, key, chunks):
+        """
+        Les morceaux sont accumulés jusqu'à MULTIPART_THRESHOLD : un petit objet part en un seul put_object,
+        un gros est envoyé en flux par un téléversement en plusieurs parties.
+        """
+        s3 = get_s3_client()
+        encoding = encoding_from_key(key)
+        extra_args = {"ContentEncoding": encoding} if encoding is not None else {}
+        chunks = encode_chunks(chunks, encoding)
+        head, size = [], 0
+        for chunk in chunks:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= MULTIPART_THRESHOLD:
+                config = lazy_import("boto3.s3.transfer").TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, multipart_chunksize=MULTIPART_THRESHOLD)
+                s3.upload_fileobj(_ChunkStream(itertools.chain(head, chunks)), self.bucket_name, key,
+                                  ExtraArgs=extra_args, Config=config)
+                return
+        s3.put_object(Bucket=self.bucket_name, Key=key, Body=b"".join(head), **extra_args)
+
+    def list(self, prefix=""):
+        keys = []
+        for page in get_s3_client().get_paginator('list_objects_v2').paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []) if not obj["Key"].endswith("/"))
+        return sorted(keys)
+
+    def head(self, key):
+        try:
+            response = get_s3_client().head_object(Bucket=self.bucket_name, Key=key)
+        except lazy_import("botocore.exceptions").ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return {"size": response["ContentLength"]}
+
+
+class LocalStorage(Storage):
+    """ Objets rangés dans un dossier local (un fichier par clé) : permet de tout exécuter sans AWS ni réseau """
+
+    def __init__(self, root, bucket_name=None, **prefixes):
+        super().__init__(bucket_name or os.path.basename(os.path.normpath(root)), **prefixes)
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def open_raw(self, key):
+        return open(self.path(key), "rb"), None
+
+    def map(self, key):
+        with open(self.path(key), "rb") as f:
+            if encoding_from_key(key) is not None or encoding_from_magic(f.read(4)) is not None:
+                return self.get(key)  # Objet compressé : décompressé en mémoire
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def put(self, key, chunks):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Écriture dans un fichier temporaire puis renommage : un lecteur concurrent ne voit jamais d'objet partiel
+        tmp_path = f"{path}.{os.getpid()}.part"
+        with open(tmp_path, "wb") as f:
+            for chunk in encode_chunks(chunks, encoding_from_key(key)):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    def list(self, prefix=""):
+        keys = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                key = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                if key.startswith(prefix) and not key.endswith(".part"):
+                    keys.append(key)
+        return sorted(keys)
+
+    def head(self, key):
+        try:
+            return {"size": os.path.getsize(self.path(key))}
+        except FileNotFoundError:
+            return None
+
+
+def resolve_storage(settings=None):
+    """
+    Stockage décrit par settings (un événement, voir STORAGE_EVENT_KEYS) : chaque paramètre absent est pris
+    dans sa variable d'environnement, puis à sa valeur par défaut. Le dossier LOCAL_BUCKET_DIR/<bucket_name>/
+    si local_bucket_dir est défini, le bucket S3 sinon.
+
+    Le handler le résout une fois par invocation et le passe explicitement aux fonctions qui lisent ou écrivent
+    dans le bucket, ainsi qu'aux processus du batch. L'environnement n'est jamais modifié : une invocation ne
+    laisse pas ses paramètres aux suivantes quand le conteneur Lambda reste chaud.
+    """
+    settings = settings or {}
+    values = {key: settings.get(key) or os.environ.get(variable) for key, variable in STORAGE_EVENT_KEYS.items()}
+    bucket_name = values["bucket_name"] or DEFAULT_BUCKET_NAME
+    prefixes = {"graph_prefix": values["graph_prefix"] or DEFAULT_GRAPH_PREFIX,
+                "cache_prefix": values["cache_prefix"] or DEFAULT_CACHE_PREFIX}
+    if values["local_bucket_dir"]:
+        return LocalStorage(os.path.join(values["local_bucket_dir"], bucket_name), bucket_name, **prefixes)
+    return S3Storage(bucket_name, **prefixes)
+
+def get_storage(storage=None):
+    """
+    storage s'il est déjà résolu (un Storage), sinon le stockage du bucket de ce nom (par défaut la variable
+    d'environnement BUCKET_NAME, puis DEFAULT_BUCKET_NAME) configuré par l'environnement (voir resolve_storage).
+    """
+    if isinstance(storage, Storage):
+        return storage
+    return resolve_storage({"bucket_name": storage})
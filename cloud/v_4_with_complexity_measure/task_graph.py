@@ -0,0 +1,429 @@
+from array import array
+from json_stream import iter_tasks
+from lazy_imports import lazy_import
+
+
+def _typed_array(values):
+    """
+    Range des valeurs numériques dans un tableau typé : entiers 64 bits si possible,
+    flottants double précision sinon (durées non entières par exemple).
+    """
+    if isinstance(values, array):
+        return values
+    try:
+        return array("q", values)
+    except TypeError:
+        return array("d", values)
+
+
+def typecode_of(values):
+    """ Type des éléments d'un tableau typé, ou d'une vue (memoryview) sur un graphe binaire """
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _store(values, i, value):
+    """
+    values[i] = value (ajout en fin si i == len(values)) sur un tableau typé, converti en flottants si value
+    n'est pas entière. Retourne le tableau, éventuellement remplacé.
+    """
+    try:
+        if i == len(values):
+            values.append(value)
+        else:
+            values[i] = value
+    except TypeError:
+        values = array("d", values)
+        return _store(values, i, value)
+    return values
+
+
+def _build_csr(num_nodes, sources, targets, weights=None):
+    """
+    Construit une représentation CSR (offsets, indices) des listes d'adjacence
+    à partir d'une liste d'arcs (sources[k] -> targets[k]), par tri comptage.
+    Les voisins de chaque nœud conservent l'ordre d'apparition des arcs.
+    Si weights est fourni (un poids par arc), retourne aussi les poids rangés dans l'ordre CSR.
+    """
+    offsets = array("q", bytes(8 * (num_nodes + 1)))
+    for s in sources:
+        offsets[s + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    cursor = array("q", offsets[:-1])
+    indices = array("i", bytes(4 * len(sources)))
+    for s, t in zip(sources, targets):
+        indices[cursor[s]] = t
+        cursor[s] += 1
+    if weights is None:
+        return offsets, indices
+
+    sorted_weights = array(weights.typecode, weights)
+    cursor = array("q", offsets[:-1])
+    for s, w in zip(sources, weights):
+        sorted_weights[cursor[s]] = w
+        cursor[s] += 1
+    return offsets, indices, sorted_weights
+
+
+def parse_dependency(dep, bandwidth):
+    """
+    Décode une dépendance du JSON d'entrée : soit un identifiant, soit un objet
+    {"id": ..., "latency": ..., "data_size": ...}. Retourne (identifiant, coût de communication),
+    le coût valant None pour un simple identifiant. data_size est converti en temps
+    de transfert par bandwidth (unités de données par unité de temps, 1 par défaut).
+    """
+    if not isinstance(dep, dict):
+        return dep, None
+    cost = dep.get("latency", 0)
+    if "data_size" in dep:
+        cost += dep["data_size"] / (bandwidth or 1)
+    return dep["id"], cost
+
+
+def _compile_etc(ids, durations, etc_rows, core_speeds):
+    """
+    Construit la matrice ETC (expected time to compute) aplatie ligne par ligne : etc[i * M + m] est
+    la durée de la tâche i sur le core m. Une tâche sans ligne ETC explicite prend duration / speed
+    sur chaque core. Retourne (None, None) si les cores sont identiques.
+    """
+    if core_speeds is None and not any(row is not None for row in etc_rows):
+        return None, None
+    if core_speeds is not None:
+        num_cores = len(core_speeds)
+    else:
+        num_cores = len(next(row for row in etc_rows if row is not None))
+
+    values = []
+    for i, row in enumerate(etc_rows):
+        if row is None:
+            if core_speeds is None:
+                raise ValueError(f"La tâche {ids[i]} n'a pas de ligne ETC et aucun core_speeds n'est fourni")
+            row = [durations[i] / speed for speed in core_speeds]
+        elif len(row) != num_cores:
+            raise ValueError(f"La ligne ETC de la tâche {ids[i]} a {len(row)} valeurs au lieu de {num_cores}")
+        values.extend(row)
+    return _typed_array(values), num_cores
+
+
+class TaskGraph:
+    """
+    Graphe de tâches compilé pour l'ordonnanceur.
+
+    Les identifiants ("task123", ...) sont internés en entiers denses 0..N-1 (dans l'ordre
+    d'apparition, comme les nœuds d'un DiGraph NetworkX), les durées et mémoires sont rangées
+    dans des tableaux typés, et les prédécesseurs / successeurs sont stockés au format CSR :
+    les voisins du nœud i sont indices[offsets[i]:offsets[i+1]].
+
+    Pour des cores hétérogènes, etc contient la matrice ETC aplatie (num_cores valeurs par tâche) ;
+    elle vaut None quand tous les cores exécutent une tâche en sa durée nominale.
+    pred_costs donne, dans l'ordre de pred_indices, le coût de communication de chaque dépendance
+    (payé seulement si le prédécesseur tourne sur un autre core) ; None si le graphe n'en décrit pas.
+    """
+
+    __slots__ = ("ids", "index", "durations", "memories",
+                 "pred_offsets", "pred_indices", "succ_offsets", "succ_indices", "etc", "num_cores",
+                 "pred_costs")
+
+    def __init__(self, ids, durations, memories, pred_offsets, pred_indices, succ_offsets, succ_indices,
+                 etc=None, num_cores=None, pred_costs=None):
+        self.ids = ids
+        self.index = {task_id: i for i, task_id in enumerate(ids)}
+        self.durations = durations
+        self.memories = memories
+        self.pred_offsets = pred_offsets
+        self.pred_indices = pred_indices
+        self.succ_offsets = succ_offsets
+        self.succ_indices = succ_indices
+        self.etc = etc
+        self.num_cores = num_cores
+        self.pred_costs = pred_costs
+
+    @classmethod
+    def from_edges(cls, ids, durations, memories, sources, targets, etc_rows=None, core_speeds=None, costs=None):
+        """
+        Construit le graphe compilé à partir des attributs des nœuds (indexés 0..N-1)
+        et de la liste des arcs sources[k] -> targets[k].
+        etc_rows (une ligne ETC ou None par nœud) et core_speeds décrivent des cores hétérogènes,
+        costs (un coût de communication par arc) les transferts de données entre cores.
+        """
+        n = len(ids)
+        if costs is None:
+            pred_offsets, pred_indices = _build_csr(n, targets, sources)
+            pred_costs = None
+        else:
+            pred_offsets, pred_indices, pred_costs = _build_csr(n, targets, sources, _typed_array(costs))
+        succ_offsets, succ_indices = _build_csr(n, sources, targets)
+        etc, num_cores = _compile_etc(ids, durations, etc_rows or [None] * n, core_speeds)
+        return cls(ids, _typed_array(durations), _typed_array(memories),
+                   pred_offsets, pred_indices, succ_offsets, succ_indices, etc, num_cores, pred_costs)
+
+    @classmethod
+    def from_tasks(cls, tasks, core_speeds=None, bandwidth=None):
+        """
+        Compile une liste (ou un itérable) de tâches au format JSON d'entrée
+        ({"id": ..., "duration": ..., "memory": ..., "dependencies": [...]}).
+        Voir TaskGraphBuilder pour les cores hétérogènes et les coûts de communication.
+        """
+        builder = TaskGraphBuilder()
+        for task in tasks:
+            builder.add_task(task)
+        return builder.build(core_speeds, bandwidth)
+
+    @classmethod
+    def from_json_stream(cls, stream, header=None, on_task=None):
+        """
+        Compile un fichier de graphe JSON lu en flux (fichier ouvert en lecture, corps d'une réponse S3...) :
+        les tâches sont transmises une à une au TaskGraphBuilder sans que le document soit chargé en entier,
+        si bien que le pic mémoire reste de l'ordre de la taille du graphe compilé.
+        Les clés de premier niveau autres que "tasks" sont rangées dans header (si fourni), et on_task
+        (si fourni) est appelé sur chaque tâche lue.
+        """
+        if header is None:
+            header = {}
+        builder = TaskGraphBuilder()
+        for task in iter_tasks(stream, header):
+            if on_task is not None:
+                on_task(task)
+            builder.add_task(task)
+        return builder.build(header.get("core_speeds"), header.get("bandwidth"))
+
+    @classmethod
+    def from_graph_data(cls, data):
+        """ Compile le contenu d'un fichier de graphe JSON ("tasks", et éventuellement "core_speeds", "bandwidth") """
+        return cls.from_tasks(data["tasks"], data.get("core_speeds"), data.get("bandwidth"))
+
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Compile un DiGraph NetworkX dont les nœuds portent les attributs "time" et "memory"
+        (et éventuellement "etc", avec G.graph["core_speeds"] pour des cores hétérogènes).
+        Les arcs peuvent porter un attribut "cost" (coût de communication).
+        """
+        ids = list(G.nodes())
+        index = {task_id: i for i, task_id in enumerate(ids)}
+        durations = [G.nodes[task_id].get("time", 1) for task_id in ids]
+        memories = [G.nodes[task_id].get("memory", 0) for task_id in ids]
+        etc_rows = [G.nodes[task_id].get("etc") for task_id in ids]
+        sources = array("i")
+        targets = array("i")
+        costs = []
+        for u, v, cost in G.edges(data="cost"):
+            sources.append(index[u])
+            targets.append(index[v])
+            costs.append(cost)
+        has_costs = any(cost is not None for cost in costs)
+        return cls.from_edges(ids, durations, memories, sources, targets, etc_rows, G.graph.get("core_speeds"),
+                              [cost or 0 for cost in costs] if has_costs else None)
+
+    def to_networkx(self):
+        """ Reconstruit un DiGraph NetworkX équivalent (identifiants d'origine) """
+        nx = lazy_import("networkx")
+        G = nx.DiGraph()
+        for i, task_id in enumerate(self.ids):
+            G.add_node(task_id, time=self.durations[i], memory=self.memories[i])
+            if self.etc is not None:
+                G.nodes[task_id]["etc"] = list(self.etc_row(i))
+        for i, task_id in enumerate(self.ids):
+            for k in range(self.pred_offsets[i], self.pred_offsets[i + 1]):
+                if self.pred_costs is None:
+                    G.add_edge(self.ids[self.pred_indices[k]], task_id)
+                else:
+                    G.add_edge(self.ids[self.pred_indices[k]], task_id, cost=self.pred_costs[k])
+        return G
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def time_typecode(self):
+        """
+        Type des dates de l'ordonnancement : flottant dès que les durées effectives (matrice ETC si elle
+        existe, sinon durées) ou les coûts de communication le sont, entier sinon.
+        """
+        times = self.etc if self.etc is not None else self.durations
+        if typecode_of(times) == "d" or (self.pred_costs is not None and typecode_of(self.pred_costs) == "d"):
+            return "d"
+        return "q"
+
+    def etc_row(self, i):
+        """ Durées de la tâche i sur chacun des cores (cores hétérogènes uniquement) """
+        return self.etc[i * self.num_cores:(i + 1) * self.num_cores]
+
+    @property
+    def num_edges(self):
+        return len(self.pred_indices)
+
+    def predecessors(self, i):
+        return self.pred_indices[self.pred_offsets[i]:self.pred_offsets[i + 1]]
+
+    def successors(self, i):
+        return self.succ_indices[self.succ_offsets[i]:self.succ_offsets[i + 1]]
+
+    def in_degree(self, i):
+        return self.pred_offsets[i + 1] - self.pred_offsets[i]
+
+    def in_degrees(self):
+        """ Nombre de prédécesseurs de chaque tâche, dans un tableau typé """
+        offsets = self.pred_offsets
+        return array("i", [offsets[i + 1] - offsets[i] for i in range(len(self.ids))])
+
+    def levels(self):
+        """
+        Niveau de chaque tâche (0 pour une tâche sans dépendance, sinon 1 + le niveau maximal de ses
+        prédécesseurs), calculé par l'algorithme de Kahn sur les CSR en O(N + E).
+        Lève une exception si le graphe comporte un cycle.
+        """
+        n = len(self.ids)
+        remaining_deps = self.in_degrees()
+        level = array("i", bytes(4 * n))
+        ready = [i for i in range(n) if remaining_deps[i] == 0]
+        visited = 0
+        while ready:
+            i = ready.pop()
+            visited += 1
+            for j in self.successors(i):
+                if level[j] <= level[i]:
+                    level[j] = level[i] + 1
+                remaining_deps[j] -= 1
+                if remaining_deps[j] == 0:
+                    ready.append(j)
+        if visited != n:
+            raise Exception(f"Le graphe comporte un cycle ({n - visited} tâches n'ont jamais été prêtes).")
+        return level
+
+
+class TaskGraphBuilder:
+    """
+    Construction incrémentale d'un TaskGraph, une tâche à la fois : les attributs et les arcs sont accumulés
+    directement dans des tableaux typés, ce qui permet d'alimenter le graphe compilé depuis une lecture en flux.
+
+    Une dépendance vers une tâche non décrite crée un nœud de durée 1, comme le ferait G.add_edge()
+    suivi de G.nodes[task].get("time", 1), et une dépendance listée deux fois ne crée qu'un arc.
+
+    Cores hétérogènes : core_speeds (passé à build) donne un facteur de vitesse par core (durée / vitesse),
+    et une tâche peut fournir sa ligne de la matrice ETC ("etc": [durée sur chaque core]).
+
+    Communications : une dépendance peut être un objet {"id": ..., "latency": ..., "data_size": ...},
+    dont le coût (latency + data_size / bandwidth) n'est payé qu'entre deux cores différents.
+    bandwidth n'est utilisé qu'à la construction finale : il peut apparaître après les tâches dans le fichier.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.durations = array("q")
+        self.memories = array("q")
+        self.sources = array("i")
+        self.targets = array("i")
+        self.etc_rows = None  # Créés à la première ligne ETC ou au premier coût de communication
+        self.latencies = None
+        self.data_sizes = None
+
+    def _intern(self, task_id):
+        i = self.index.get(task_id)
+        if i is None:
+            i = self.index[task_id] = len(self.ids)
+            self.ids.append(task_id)
+            self.durations.append(1)
+            self.memories.append(0)
+            if self.etc_rows is not None:
+                self.etc_rows.append(None)
+        return i
+
+    def add_task(self, task):
+        t = self._intern(task["id"])
+        self.durations = _store(self.durations, t, task["duration"])
+        self.memories = _store(self.memories, t, task["memory"])
+        if "etc" in task:
+            if self.etc_rows is None:
+                self.etc_rows = [None] * len(self.ids)
+            self.etc_rows[t] = task["etc"]
+
+        task_sources = set()
+        for dep in task["dependencies"]:
+            if isinstance(dep, dict):
+                s = self._intern(dep["id"])
+                if self.latencies is None:
+                    self.latencies = array("q", bytes(8 * len(self.sources)))
+                    self.data_sizes = array("q", bytes(8 * len(self.sources)))
+            else:
+                s = self._intern(dep)
+            if s in task_sources:
+                continue
+            task_sources.add(s)
+            self.sources.append(s)
+            self.targets.append(t)
+            if self.latencies is not None:
+                k = len(self.sources) - 1
+                latency, data_size = (dep.get("latency", 0), dep.get("data_size", 0)) if isinstance(dep, dict) else (0, 0)
+                self.latencies = _store(self.latencies, k, latency)
+                self.data_sizes = _store(self.data_sizes, k, data_size)
+
+    def build(self, core_speeds=None, bandwidth=None):
+        """ Compile le graphe accumulé (CSR, matrice ETC, coûts de communication) """
+        costs = None
+        if self.latencies is not None:
+            costs = [latency + (data_size / (bandwidth or 1) if data_size else 0)
+                     for latency, data_size in zip(self.latencies, self.data_sizes)]
+        return TaskGraph.from_edges(self.ids, self.durations, self.memories, self.sources, self.targets,
+                                    self.etc_rows, core_speeds, costs)
+
+
+class CompiledSchedule:
+    """
+    Planning produit par l'ordonnanceur sur un TaskGraph : pour chaque tâche (indice entier),
+    la machine, la date de début et la date de fin. order conserve l'ordre de planification.
+    Les identifiants d'origine ne sont retrouvés qu'à la conversion (items(), to_dict()).
+    """
+
+    __slots__ = ("graph", "machine", "start", "finish", "order")
+
+    def __init__(self, graph, machine, start, finish, order):
+        self.graph = graph
+        self.machine = machine
+        self.start = start
+        self.finish = finish
+        self.order = order
+
+    @classmethod
+    def empty(cls, graph):
+        """ Planning vide, à remplir par l'ordonnanceur """
+        n = len(graph)
+        return cls(graph, array("i", [-1]) * n, array(graph.time_typecode, [0]) * n,
+                   array(graph.time_typecode, [0]) * n, array("i"))
+
+    def __len__(self):
+        return len(self.order)
+
+    def place(self, task, machine, start_time, finish_time):
+        """ Enregistre la planification de task """
+        self.machine[task] = machine
+        self.start[task] = start_time
+        self.finish[task] = finish_time
+        self.order.append(task)
+
+    def items(self):
+        """ Itère sur (tâche, (machine, start_time, finish_time)) dans l'ordre de planification """
+        ids = self.graph.ids
+        for t in self.order:
+            yield ids[t], (self.machine[t], self.start[t], self.finish[t])
+
+    def to_dict(self):
+        """ Planning au format historique { tâche: (machine, start_time, finish_time) } """
+        return dict(self.items())
+
+    def columns(self, num_machines):
+        """
+        Planning en colonnes : pour chaque core, les indices des tâches, leurs dates de début et de fin
+        (trois tableaux typés), dans l'ordre de planification, qui est aussi celui des dates de début.
+        """
+        tasks = [array("i") for _ in range(num_machines)]
+        starts = [array(typecode_of(self.start)) for _ in range(num_machines)]
+        finishes = [array(typecode_of(self.finish)) for _ in range(num_machines)]
+        for t in self.order:
+            m = self.machine[t]
+            tasks[m].append(t)
+            starts[m].append(self.start[t])
+            finishes[m].append(self.finish[t])
+        return tasks, starts, finishes
@@ -1,62 +1,183 @@
-import boto3
-import networkx as nx
 import random
 import json
+import hashlib
 import os
+import multiprocessing
+import multiprocessing.connection
+from lazy_imports import lazy_import
+from storage import get_storage
+from compression import key_with_encoding
+from task_graph import TaskGraph
+from graph_binary import BINARY_SUFFIX, dump_task_graph
+from graph_families import generate_family_graph
 
-def upload_on_bucket(local_path, bucket_key, bucket_name = "central-supelec-data-groupe1"):
+def upload_on_bucket(local_path, bucket_key, storage = None):
+    """ Téléverse le fichier local_path sous bucket_key (storage : Storage résolu ou nom de bucket, voir storage.get_storage) """
+    storage = get_storage(storage)
+    with open(local_path, "rb") as f:
+        storage.put(bucket_key, iter(lambda: f.read(1 << 20), b""))
     
-    # Configuration du client S3
-    s3 = boto3.client('s3')
+    return {"StatusCode" : 100,
+            "body" : f"Le document {local_path} a été téléversé dans {storage.bucket_name}",
+            "destination_key" : bucket_key,
+            "bucket_name": storage.bucket_name }
 
-    # Télécharger le fichier modifié vers S3
-    s3.upload_file(local_path, bucket_name, bucket_key)
+def download_from_bucket(local_path, bucket_key, storage = None):
+    """ Télécharge l'objet bucket_key dans le fichier local_path """
+    storage = get_storage(storage)
+    with storage.open(bucket_key) as stream, open(local_path, "wb") as f:
+        for chunk in iter(lambda: stream.read(1 << 20), b""):
+            f.write(chunk)
     
     return {"StatusCode" : 100,
-            "body" : f"Le document {local_path} a été téléversé dans {bucket_name}",
+            "body" : f"Le document {bucket_key} a été téléchargé depuis {storage.bucket_name}",
+            "local_path" : local_path}
+
+def open_from_bucket(bucket_key, storage = None):
+    """
+    Ouvre l'objet bucket_key en lecture binaire et en flux (sans copie dans /tmp) : le fichier local qui
+    tient lieu de l'objet, ou le corps de la réponse S3. À utiliser dans un bloc with.
+    """
+    return get_storage(storage).open(bucket_key)
+
+def read_from_bucket(bucket_key, storage = None):
+    """ Retourne le contenu (bytes) de l'objet bucket_key, lu directement en mémoire """
+    return get_storage(storage).get(bucket_key)
+
+def write_chunks_to_bucket(chunks, bucket_key, storage = None):
+    """
+    Téléverse sous bucket_key un objet produit morceau par morceau (itérable de bytes), sans fichier
+    intermédiaire dans /tmp (en plusieurs parties sur S3 au-delà de storage.MULTIPART_THRESHOLD).
+    """
+    storage = get_storage(storage)
+    storage.put(bucket_key, chunks)
+
+    return {"StatusCode" : 100,
+            "body" : f"Le document {bucket_key} a été téléversé dans {storage.bucket_name}",
             "destination_key" : bucket_key,
-            "bucket_name": bucket_name }
+            "bucket_name": storage.bucket_name }
 
-def download_from_bucket(local_path, bucket_key, bucket_name = "central-supelec-data-groupe1"):
-    
-    # Configuration du client S3
-    s3 = boto3.client('s3')
+def write_to_bucket(data, bucket_key, storage = None):
+    """ Téléverse le contenu data (bytes) sous bucket_key """
+    return write_chunks_to_bucket([data], bucket_key, storage)
+
+def _json_chunks(obj, indent=None, chunk_size=1 << 16):
+    """ Encode obj en JSON (UTF-8) par morceaux d'environ chunk_size octets, sans construire la chaîne complète """
+    pending, size = [], 0
+    for piece in json.JSONEncoder(indent=indent).iterencode(obj):
+        pending.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
 
-    # Télécharger le fichier JSON depuis S3
-    s3.download_file(bucket_name, bucket_key, local_path)
+def write_json_to_bucket(obj, bucket_key, storage = None, indent=None):
+    """ Téléverse obj encodé en JSON sous bucket_key, l'encodage étant envoyé au fil de l'eau """
+    return write_chunks_to_bucket(_json_chunks(obj, indent), bucket_key, storage)
+
+def list_bucket_keys(prefix, storage = None):
+    """ Liste (triées) les clés des objets du bucket qui commencent par prefix, hors pseudo-dossiers """
+    return get_storage(storage).list(prefix)
+
+def _pipe_worker(func, conn):
+    """ Boucle d'un processus de parallel_map : reçoit (indice, arguments), renvoie (indice, résultat) """
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        index, args = job
+        try:
+            conn.send((index, func(*args)))
+        except Exception as e:
+            conn.send((index, e))
+    conn.close()
+
+def parallel_map(func, args_list, workers=None):
+    """
+    Calcule func(*args) pour chaque élément de args_list dans un groupe de processus (un par vCPU par défaut)
+    et retourne les résultats dans l'ordre de args_list.
     
-    return {"StatusCode" : 100,
-            "body" : f"Le document {bucket_key} a été téléchargé depuis {bucket_name}",
-            "local_path" : local_path}
+    multiprocessing.Pool et concurrent.futures reposent sur /dev/shm, absent de l'environnement Lambda :
+    les processus sont donc pilotés par des Pipe, et chacun reçoit un nouvel élément dès qu'il a rendu
+    le précédent (les graphes de tailles différentes se répartissent ainsi d'eux-mêmes).
+    """
+    args_list = list(args_list)
+    workers = min(workers or os.cpu_count() or 1, len(args_list))
+    if workers <= 1:
+        return [func(*args) for args in args_list]
+    
+    results = [None] * len(args_list)
+    jobs = iter(enumerate(args_list))
+    processes = []
+    active = []
+    for _ in range(workers):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_pipe_worker, args=(func, child_conn), daemon=True)
+        process.start()
+        child_conn.close()
+        processes.append(process)
+        parent_conn.send(next(jobs))
+        active.append(parent_conn)
+    
+    while active:
+        for conn in multiprocessing.connection.wait(active):
+            index, result = conn.recv()
+            results[index] = result
+            job = next(jobs, None)
+            conn.send(job)
+            if job is None:
+                active.remove(conn)
+    for process in processes:
+        process.join()
+    
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
     
-def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None):
-    """ Génère un graphe de tâches avec des dépendances aléatoires """
+def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None, as_networkx=True, legacy=False):
+    """
+    Génère un graphe de tâches avec des dépendances aléatoires.
+    Avec as_networkx=False, le graphe retourné est un TaskGraph compilé (NetworkX n'est pas chargé),
+    à tirage aléatoire identique.
+    
+    Les parents d'une tâche sont tirés par indice parmi les tâches qui la précèdent, en O(k) pour k dépendances.
+    legacy=True reproduit, à graine égale, les graphes de l'ancien générateur : il comparait les noms des
+    tâches ("task10" < "task2") et tirait donc les parents parmi les tâches de nom inférieur, en O(N) par tâche.
+    """
 
     # Initialiser la graine aléatoire si fournie
     if random_seed is None:
         random_seed = random.randint(0, 99999)  # Générer une graine aléatoire
-    random.seed(random_seed)
+    rng = random.Random(random_seed)  # Générateur local : l'état du module random n'est pas modifié
 
-    G = nx.DiGraph()  # Graphe orienté
     tasks = [f"task{i}" for i in range(1, num_tasks + 1)]  # Création des tâches
-    G.add_nodes_from(tasks)  # Ajout des tâches comme nœuds
+    if as_networkx:
+        nx = lazy_import("networkx")
+        G = nx.DiGraph()  # Graphe orienté
+        G.add_nodes_from(tasks)  # Ajout des tâches comme nœuds
     
     task_data = {}  # Dictionnaire pour stocker les infos des tâches
 
     # Déterminer max_dependencies aléatoirement si non fourni
     if max_dependencies is None:
-        max_dependencies = random.randint(1, num_tasks - 1)  # Plus de flexibilité
+        max_dependencies = rng.randint(1, num_tasks - 1)  # Plus de flexibilité
 
-    for task in tasks:
+    for i, task in enumerate(tasks):
         # Génération aléatoire des attributs
-        duration = random.randint(5, 30)  # Durée entre 5 et 30 unités
-        memory = random.choice([256, 512, 1024, 2048])  # Mémoire en Mo
+        duration = rng.randint(5, 30)  # Durée entre 5 et 30 unités
+        memory = rng.choice([256, 512, 1024, 2048])  # Mémoire en Mo
         
         # Déterminer les dépendances
-        if task != "task1":  # La première tâche n'a pas de dépendances
-            num_deps = random.randint(1, min(max_dependencies, len(tasks) - 1))  
-            possible_parents = [t for t in tasks if t < task]  # Seulement les tâches précédentes
-            selected_parents = random.sample(possible_parents, min(len(possible_parents), num_deps))  # Choix aléatoire
+        if i > 0:  # La première tâche n'a pas de dépendances
+            num_deps = rng.randint(1, min(max_dependencies, len(tasks) - 1))  
+            if legacy:
+                possible_parents = [t for t in tasks if t < task]  # Tâches de nom inférieur (ancien tirage)
+                selected_parents = rng.sample(possible_parents, min(len(possible_parents), num_deps))
+            else:
+                selected_parents = [tasks[j] for j in rng.sample(range(i), min(i, num_deps))]  # Tâches précédentes
         else:
             selected_parents = []
         
@@ -69,52 +190,273 @@ def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None):
         }
         
         # Ajouter les dépendances dans le graphe
-        for dep in selected_parents:
-            G.add_edge(dep, task)
+        if as_networkx:
+            for dep in selected_parents:
+                G.add_edge(dep, task)
     
+    if not as_networkx:
+        # Tâches indexées dans l'ordre de création, comme les nœuds du DiGraph
+        index = {task: i for i, task in enumerate(tasks)}
+        G = TaskGraph.from_edges(tasks,
+                                 [task_data[task]["duration"] for task in tasks],
+                                 [task_data[task]["memory"] for task in tasks],
+                                 [index[dep] for task in tasks for dep in task_data[task]["dependencies"]],
+                                 [index[task] for task in tasks for dep in task_data[task]["dependencies"]])
     return G, task_data, random_seed, max_dependencies
 
-def save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed):
-    """ Sauvegarde le graphe sous format JSON """
-    graph_json = {
-        "graph_id": f"task_graph_ntask_{num_tasks}_max_dep_{max_dependencies}_seed_{random_seed}",
+def generate_task_graph_numpy(num_tasks, max_dependencies=None, random_seed=None):
+    """
+    Variante vectorisée de generate_task_graph pour les graphes de plusieurs millions de tâches : durées,
+    mémoires, nombres de dépendances et parents sont tirés en tableaux NumPy (numpy.random.default_rng(random_seed)),
+    et les listes d'adjacence du graphe compilé en sont déduites directement, sans DiGraph ni dictionnaire task_data.
+    Mêmes lois que generate_task_graph mais pas le même tirage : à graine égale, le graphe n'est le même
+    qu'avec le même générateur.
+    Retourne (TaskGraph, random_seed, max_dependencies).
+    """
+    try:
+        np = lazy_import("numpy")
+    except ImportError:  # NumPy n'est pas fourni par la couche Lambda
+        raise ValueError("La génération vectorisée nécessite NumPy")
+
+    if random_seed is None:
+        random_seed = random.randint(0, 99999)  # Générer une graine aléatoire
+    rng = np.random.default_rng(random_seed)
+    if max_dependencies is None:
+        max_dependencies = int(rng.integers(1, num_tasks))  # Entre 1 et num_tasks - 1
+
+    n = num_tasks
+    durations = rng.integers(5, 31, size=n)  # Durée entre 5 et 30 unités
+    memories = rng.choice(np.array([256, 512, 1024, 2048]), size=n)  # Mémoire en Mo
+    # Nombre de dépendances de chaque tâche, borné par le nombre de tâches qui la précèdent (0 pour la première)
+    counts = np.minimum(rng.integers(1, max(min(max_dependencies, n - 1), 1) + 1, size=n), np.arange(n))
+
+    # Parents tirés uniformément parmi les tâches précédentes, sans doublon. Une tâche qui en prend plus de la
+    # moitié tire plutôt celles qu'elle exclut : chaque tirage a ainsi au moins une chance sur deux de ne pas
+    # être un doublon, et les doublons sont retirés en quelques passes (sur les seuls arcs des tâches concernées)
+    tasks = np.arange(n)
+    dense = 2 * counts > tasks
+    targets = np.repeat(tasks, np.where(dense, tasks - counts, counts))
+    sources = rng.integers(0, targets)
+    active = np.arange(len(sources))
+    while len(active):
+        keys = targets[active] * n + sources[active]
+        order = np.argsort(keys, kind="stable")
+        duplicates = np.zeros(len(active), dtype=bool)
+        duplicates[order[1:][keys[order[1:]] == keys[order[:-1]]]] = True
+        redraw = active[duplicates]
+        sources[redraw] = rng.integers(0, targets[redraw])
+        active = active[np.isin(targets[active], targets[redraw])]
+
+    # Tâches denses : toutes les tâches précédentes, sauf celles tirées
+    excluded = dense[targets]
+    dense_tasks = tasks[dense]
+    all_targets = np.repeat(dense_tasks, dense_tasks)
+    all_sources = np.arange(len(all_targets)) - np.repeat(np.cumsum(dense_tasks) - dense_tasks, dense_tasks)
+    kept = ~np.isin(all_targets * n + all_sources, targets[excluded] * n + sources[excluded])
+    targets = np.concatenate([targets[~excluded], all_targets[kept]])
+    sources = np.concatenate([sources[~excluded], all_sources[kept]])
+    order = np.argsort(targets, kind="stable")  # Arcs rangés par tâche cible (ordre CSR)
+    targets, sources = targets[order], sources[order]
+
+    pred_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=pred_offsets[1:])
+    succ_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=succ_offsets[1:])
+    succ_indices = targets[np.argsort(sources, kind="stable")]
+
+    def view(values, dtype, typecode):
+        # Vue typée (comme celles d'un graphe binaire) sur un tableau NumPy, sans copie
+        return memoryview(np.ascontiguousarray(values, dtype=dtype)).cast("B").cast(typecode)
+
+    graph = TaskGraph([f"task{i}" for i in range(1, n + 1)],
+                      view(durations, np.int64, "q"), view(memories, np.int64, "q"),
+                      view(pred_offsets, np.int64, "q"), view(sources, np.int32, "i"),
+                      view(succ_offsets, np.int64, "q"), view(succ_indices, np.int32, "i"))
+    return graph, random_seed, max_dependencies
+
+# Générateurs de graphes aléatoires : "python" (generate_task_graph), "legacy" (tirage de l'ancien générateur,
+# voir generate_task_graph) et "numpy" (generate_task_graph_numpy, pour les très grands graphes)
+GRAPH_GENERATORS = ("python", "legacy", "numpy")
+
+def _graph_names(num_tasks, max_dependencies, random_seed, generator):
+    """ (graph_id, nom de fichier sans extension) d'un graphe généré ; le générateur est indiqué s'il n'est pas "python" """
+    suffix = "" if generator == "python" else f"_{generator}"
+    return (f"task_graph_ntask_{num_tasks}_max_dep_{max_dependencies}_seed_{random_seed}{suffix}",
+            f"task_graph_{num_tasks}_{max_dependencies}_seed_{random_seed}{suffix}")
+
+def _task_graph_json_chunks(header, graph, chunk_size=1 << 16):
+    """ JSON d'entrée d'un graphe compilé (header complété de "tasks"), produit par morceaux tâche par tâche """
+    pending = [json.dumps(header)[:-1], ', "tasks": [']
+    size = 0
+    for i, task_id in enumerate(graph.ids):
+        task = {"id": task_id, "duration": graph.durations[i], "memory": graph.memories[i],
+                "dependencies": [graph.ids[j] for j in graph.predecessors(i)]}
+        piece = json.dumps(task) if i == 0 else ", " + json.dumps(task)
+        pending.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    pending.append("]}")
+    yield "".join(pending).encode("utf-8")
+
+def _write_graph(header, name, graph_format, compression = None, task_data = None, graph = None, storage = None):
+    """
+    Téléverse un graphe généré sous le préfixe des graphes de storage (name : nom du fichier sans extension), au
+    format graph_format ("json" ou "binary"), à partir de task_data ou du graphe compilé graph.
+    Retourne (bucket_key, bucket_name).
+    """
+    storage = get_storage(storage)
+    header = dict(header, acyclic_by_construction=True)  # Voir graph_generator
+    if graph_format == "binary":
+        if graph is None:
+            graph = TaskGraph.from_tasks(task_data.values())
+        bucket_key = storage.graph_prefix+key_with_encoding(f"{name}{BINARY_SUFFIX}", compression)
+        tmp = write_chunks_to_bucket(dump_task_graph(graph, header), bucket_key, storage)
+    else:
+        bucket_key = storage.graph_prefix+key_with_encoding(f"{name}.json", compression)
+        # Enregistrement du graphe en .json (avec indentation) sur le S3, sans passer par /tmp
+        if graph is None:
+            tmp = write_json_to_bucket(dict(header, tasks=list(task_data.values())), bucket_key, storage, indent=4)
+        else:
+            tmp = write_chunks_to_bucket(_task_graph_json_chunks(header, graph), bucket_key, storage)
+    return bucket_key, tmp["bucket_name"]
+
+def save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed, compression = None, generator = "python", graph = None,
+                       storage = None):
+    """
+    Sauvegarde le graphe sous format JSON, compressé au fil de l'écriture si compression vaut "gzip" ou "zstd".
+    graph : graphe compilé à enregistrer à la place de task_data (générateur "numpy"), écrit tâche par tâche.
+    """
+    graph_id, name = _graph_names(num_tasks, max_dependencies, random_seed, generator)
+    header = {
+        "graph_id": graph_id,
         "random_seed": random_seed,
         "max_dependencies": max_dependencies,
-        "tasks": list(task_data.values())  # Convertir le dictionnaire en liste
+        "generator": generator,
     }
+    return _write_graph(header, name, "json", compression, task_data, graph, storage)
 
-    filename = f"task_graph_{num_tasks}_{max_dependencies}_seed_{random_seed}.json"
-    bucket_key = "output_data/"+filename
-    local_path = "/tmp/"+filename
-    
-    with open(local_path, "w", encoding="utf-8") as f:
-        json.dump(graph_json, f, indent=4)  # Enregistrement avec indentation
-    tmp = upload_on_bucket(local_path, bucket_key)  # Enregistrement du graphe en .json sur le S3
-    bucket_name = tmp["bucket_name"]
-    
-    if os.path.exists(local_path):  # Supprimer le fichier temporaire après utilisation
-        os.remove(local_path)
-    
-    return bucket_key, bucket_name
+def save_graph_to_binary(task_data, num_tasks, max_dependencies, random_seed, compression = None, generator = "python", graph = None,
+                         storage = None):
+    """
+    Sauvegarde le graphe sous forme compilée, au format binaire (voir graph_binary), chargeable sans analyse
+    (et projeté en mémoire s'il n'est pas compressé). graph : graphe déjà compilé (générateur "numpy").
+    """
+    graph_id, name = _graph_names(num_tasks, max_dependencies, random_seed, generator)
+    header = {
+        "graph_id": graph_id,
+        "random_seed": random_seed,
+        "max_dependencies": max_dependencies,
+        "generator": generator,
+    }
+    return _write_graph(header, name, "binary", compression, task_data, graph, storage)
+
+def save_family_graph(graph, shape, random_seed, graph_format = "json", compression = None, storage = None):
+    """ Sauvegarde un graphe structuré (voir graph_families.generate_family_graph) ; shape : {"family", "width", "fan"} """
+    family, width, fan = shape["family"], shape["width"], shape["fan"]
+    dimensions = f"{len(graph)}" + (f"_w_{width}" if width is not None else "") + (f"_fan_{fan}" if fan is not None else "")
+    header = {
+        "graph_id": f"task_graph_{family}_ntask_{dimensions}_seed_{random_seed}",
+        "random_seed": random_seed,
+        "family": family,
+        "width": width,
+        "fan": fan,
+    }
+    return _write_graph(header, f"task_graph_{family}_{dimensions}_seed_{random_seed}", graph_format, compression, graph=graph,
+                        storage=storage)
 
-def graph_generator(num_tasks, random_seed = None, max_dependencies = None):
+def graph_generator(num_tasks, random_seed = None, max_dependencies = None, graph_format = "json", compression = None, generator = "python",
+                    family = "random", width = None, depth = None, fan = None, validate = False, storage = None):
     """ Fonction principale du générateur de graphes : génère un graphe de tâches avec dépendances aléatoires et l'enregistre en JSON.
             - num_tasks : Nombre de tâches à générer
             - random_seed : Graine aléatoire pour reproduire le graphe (optionnel)
-            - max_dependencies : Nombre maximal de dépendances par tâche (optionnel, aléatoire si absent)"""
+            - max_dependencies : Nombre maximal de dépendances par tâche (optionnel, aléatoire si absent)
+            - graph_format : "json" (par défaut) ou "binary" (graphe compilé, voir save_graph_to_binary)
+            - compression : None (par défaut), "gzip" ou "zstd"
+            - generator : "python" (par défaut), "legacy" ou "numpy" (voir GRAPH_GENERATORS)
+            - family : "random" (par défaut) ou une famille de graphes structurés (voir graph_families.GRAPH_FAMILIES),
+              de paramètres width, depth et fan (max_dependencies et generator sont alors ignorés)
+            - validate : vérifie que le graphe est acyclique avant de l'enregistrer (False par défaut)
+            - storage : stockage où enregistrer le graphe (voir storage.get_storage ; par défaut, celui de l'environnement)
+
+        Tous les générateurs produisent des graphes acycliques par construction : chaque arc va d'une tâche vers
+        une tâche créée après elle (de nom supérieur pour "legacy"), ce qu'indique "acyclic_by_construction" dans
+        les métadonnées du graphe. La vérification, un parcours de Kahn en O(N + E) sur le graphe compilé
+        (TaskGraph.levels), n'est donc faite qu'à la demande. """
+
+    if generator not in GRAPH_GENERATORS:
+        raise ValueError(f"Générateur de graphes inconnu : {generator}")
+    if graph_format not in ("json", "binary"):
+        raise ValueError(f"Format de graphe inconnu : {graph_format}")
 
-    # Générer le graphe avec ou sans seed et max_dependencies
-    G, task_data, random_seed, max_dependencies = generate_task_graph(num_tasks, max_dependencies, random_seed)
+    # Générer le graphe (structuré, ou aléatoire avec ou sans seed et max_dependencies), directement compilé
+    task_data = None
+    if family != "random":
+        graph, random_seed, shape = generate_family_graph(family, num_tasks, width, depth, fan, random_seed)
+    elif generator == "numpy":
+        graph, random_seed, max_dependencies = generate_task_graph_numpy(num_tasks, max_dependencies, random_seed)
+    else:
+        graph, task_data, random_seed, max_dependencies = generate_task_graph(num_tasks, max_dependencies, random_seed,
+                                                                              as_networkx=False, legacy=generator == "legacy")
 
-    assert nx.is_directed_acyclic_graph(G), f"Le graphe généré task_graph_{num_tasks}_{max_dependencies}_seed_{random_seed}.json contient un cycle !"
+    if validate:
+        graph.levels()  # Lève une exception si le graphe comporte un cycle
 
-    # Sauvegarde en JSON
-    bucket_key, bucket_name = save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed)
+    # Sauvegarde en JSON, ou au format binaire
+    if family != "random":
+        bucket_key, bucket_name = save_family_graph(graph, shape, random_seed, graph_format, compression, storage)
+    elif graph_format == "binary":
+        bucket_key, bucket_name = save_graph_to_binary(task_data, num_tasks, max_dependencies, random_seed, compression, generator,
+                                                       graph, storage)
+    else:
+        # Les tâches générées en Python sont écrites telles quelles (task_data), le graphe compilé sinon
+        bucket_key, bucket_name = save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed, compression, generator,
+                                                     graph if task_data is None else None, storage)
     
     return {"body" : f"Le graphe généré {bucket_key} est disponible dans le bucket {bucket_name}",
             "graph_bucket_key" : bucket_key,
             "bucket_name" : bucket_name}
 
+def derive_seed(base_seed, *position):
+    """
+    Graine d'un graphe d'une grille, dérivée de base_seed et de sa position (num_tasks, max_dependencies, rang) :
+    reproductible, indépendante du processus qui génère le graphe et de l'ordre de génération, et différente
+    d'un graphe à l'autre (chacun a ainsi son propre flux aléatoire).
+    """
+    digest = hashlib.sha256(json.dumps([base_seed, *position]).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "little")
+
+def graph_grid_jobs(num_tasks_values, max_dependencies_values=(None,), seeds=None, num_seeds=1, base_seed=0,
+                    graph_format="json", compression=None, generator="python", validate=False, storage=None):
+    """
+    Arguments de graph_generator pour chaque graphe de la grille num_tasks_values x max_dependencies_values x graines.
+    Les graines sont seeds (les mêmes pour chaque point de la grille) ou, à défaut, num_seeds graines par point
+    dérivées de base_seed (voir derive_seed). max_dependencies None : tiré par le générateur à partir de la graine.
+    """
+    jobs = []
+    for num_tasks in num_tasks_values:
+        for max_dependencies in max_dependencies_values:
+            point_seeds = seeds if seeds is not None else [derive_seed(base_seed, num_tasks, max_dependencies, r)
+                                                           for r in range(num_seeds)]
+            for seed in point_seeds:
+                jobs.append((num_tasks, seed, max_dependencies, graph_format, compression, generator,
+                             "random", None, None, None, validate, storage))
+    return jobs
+
+def generate_graph_grid(num_tasks_values, max_dependencies_values=(None,), seeds=None, num_seeds=1, base_seed=0,
+                        graph_format="json", compression=None, generator="python", workers=None, validate=False,
+                        storage=None):
+    """
+    Génère et téléverse une grille de graphes (voir graph_grid_jobs) en parallèle avec parallel_map :
+    chaque processus génère ses graphes et les téléverse lui-même, pendant que les autres continuent à générer.
+    Chaque graphe ayant sa graine et son générateur local, le résultat ne dépend ni du nombre de processus
+    ni de l'ordre d'exécution. Retourne les résultats de graph_generator, dans l'ordre de la grille.
+    """
+    jobs = graph_grid_jobs(num_tasks_values, max_dependencies_values, seeds, num_seeds, base_seed,
+                           graph_format, compression, generator, validate, storage)
+    return parallel_map(graph_generator, jobs, workers)
+
 def get_file_name(path):
     n = 0
     for i in range(len(path)-1, -1, -1):
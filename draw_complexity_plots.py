@@ -45,6 +45,21 @@ def measure_memory_vs_N(data):
     plt.grid(True)
     plt.show()
 
+def measure_time_vs_family(data):
+    """
+    Temps d'exécution selon la forme du graphe (nombre de tâches et de machines fixés),
+    avec la profondeur de chaque graphe.
+    """
+    families = data["time_vs_family"]["families"]
+    y = data["time_vs_family"]["times"]
+    depths = [shape["depth"] for shape in data["time_vs_family"]["shapes"]]
+    plt.figure()
+    plt.bar([f"{family}\n(profondeur {depth})" for family, depth in zip(families, depths)], y)
+    plt.ylabel("Temps d'exécution (secondes)")
+    plt.title("Temps d'exécution vs Forme du graphe (tâches et machines fixées)")
+    plt.grid(True, axis="y")
+    plt.show()
+
 if __name__ == "__main__":
     
     with open("response.json", "r") as file:
@@ -59,4 +74,8 @@ if __name__ == "__main__":
     
     # Pour mesurer l'utilisation mémoire en fonction de N
     if "memory_vs_N" in data:
-        measure_memory_vs_N(data)
\ No newline at end of file
+        measure_memory_vs_N(data)
+
+    # Pour comparer les formes de graphes (familles) à N et M fixés
+    if "time_vs_family" in data:
+        measure_time_vs_family(data)
\ No newline at end of file
@@ -2,15 +2,22 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import random
 import json
+import hashlib
 import argparse
+import multiprocessing
 
-def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None):
-    """ Génère un graphe de tâches avec des dépendances aléatoires """
+def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None, legacy=False):
+    """
+    Génère un graphe de tâches avec des dépendances aléatoires.
+    Les parents d'une tâche sont tirés par indice parmi les tâches qui la précèdent, en O(k) pour k dépendances.
+    legacy=True reproduit, à graine égale, les graphes de l'ancien générateur (parents tirés parmi les tâches
+    de nom inférieur, "task10" < "task2", en O(N) par tâche).
+    """
 
     # Initialiser la graine aléatoire si fournie
     if random_seed is None:
         random_seed = random.randint(0, 99999)  # Générer une graine aléatoire
-    random.seed(random_seed)
+    rng = random.Random(random_seed)  # Générateur local : l'état du module random n'est pas modifié
 
     G = nx.DiGraph()  # Graphe orienté
     tasks = [f"task{i}" for i in range(1, num_tasks + 1)]  # Création des tâches
@@ -20,18 +27,21 @@ def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None):
 
     # Déterminer max_dependencies aléatoirement si non fourni
     if max_dependencies is None:
-        max_dependencies = random.randint(1, num_tasks - 1)  # Plus de flexibilité
+        max_dependencies = rng.randint(1, num_tasks - 1)  # Plus de flexibilité
 
-    for task in tasks:
+    for i, task in enumerate(tasks):
         # Génération aléatoire des attributs
-        duration = random.randint(5, 30)  # Durée entre 5 et 30 unités
-        memory = random.choice([256, 512, 1024, 2048])  # Mémoire en Mo
+        duration = rng.randint(5, 30)  # Durée entre 5 et 30 unités
+        memory = rng.choice([256, 512, 1024, 2048])  # Mémoire en Mo
         
         # Déterminer les dépendances
-        if task != "task1":  # La première tâche n'a pas de dépendances
-            num_deps = random.randint(1, min(max_dependencies, len(tasks) - 1))  
-            possible_parents = [t for t in tasks if t < task]  # Seulement les tâches précédentes
-            selected_parents = random.sample(possible_parents, min(len(possible_parents), num_deps))  # Choix aléatoire
+        if i > 0:  # La première tâche n'a pas de dépendances
+            num_deps = rng.randint(1, min(max_dependencies, len(tasks) - 1))  
+            if legacy:
+                possible_parents = [t for t in tasks if t < task]  # Tâches de nom inférieur (ancien tirage)
+                selected_parents = rng.sample(possible_parents, min(len(possible_parents), num_deps))
+            else:
+                selected_parents = [tasks[j] for j in rng.sample(range(i), min(i, num_deps))]  # Tâches précédentes
         else:
             selected_parents = []
         
@@ -49,50 +59,131 @@ def generate_task_graph(num_tasks, max_dependencies=None, random_seed=None):
     
     return G, task_data, random_seed, max_dependencies
 
-def save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed):
-    """ Sauvegarde le graphe sous format JSON """
+def save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed, legacy=False, verbose=True):
+    """ Sauvegarde le graphe sous format JSON et retourne le nom du fichier """
     graph_json = {
-        "graph_id": f"task_graph_ntask_{num_tasks}_max_dep_{max_dependencies}_seed_{random_seed}",
+        "graph_id": f"task_graph_ntask_{num_tasks}_max_dep_{max_dependencies}_seed_{random_seed}" + ("_legacy" if legacy else ""),
         "random_seed": random_seed,
         "max_dependencies": max_dependencies,
+        "generator": "legacy" if legacy else "python",
+        "acyclic_by_construction": True,  # Voir check_acyclic
         "tasks": list(task_data.values())  # Convertir le dictionnaire en liste
     }
 
-    filename = f"task_graph_{num_tasks}_{max_dependencies}_seed_{random_seed}.json"
+    filename = f"task_graph_{num_tasks}_{max_dependencies}_seed_{random_seed}" + ("_legacy" if legacy else "") + ".json"
     
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(graph_json, f, indent=4)  # Enregistrement avec indentation
 
-    print(f"\n✅ Graphe sauvegardé sous {filename}")
-    print(f"🔹 Pour reproduire ce graphe, utilisez la seed : {random_seed}")
-    print(f"🔹 Nombre maximal de dépendances utilisé : {max_dependencies}")
+    if verbose:
+        print(f"\n✅ Graphe sauvegardé sous {filename}")
+        print(f"🔹 Pour reproduire ce graphe, utilisez la seed : {random_seed}")
+        print(f"🔹 Nombre maximal de dépendances utilisé : {max_dependencies}")
+    return filename
+
+def derive_seed(base_seed, *position):
+    """
+    Graine d'un graphe d'une grille, dérivée de base_seed et de sa position (num_tasks, max_dependencies, rang) :
+    reproductible, indépendante du processus et de l'ordre de génération (mêmes graines que utilities.derive_seed)
+    """
+    digest = hashlib.sha256(json.dumps([base_seed, *position]).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "little")
+
+def check_acyclic(task_data):
+    """
+    Vérifie, par l'algorithme de Kahn en O(N + E) sur les listes de dépendances, que le graphe est acyclique.
+    Les graphes générés le sont par construction (chaque tâche ne dépend que de tâches créées avant elle,
+    ou de nom inférieur avec --legacy) : cette vérification n'est faite qu'avec --validate.
+    """
+    remaining_deps = {task: len(data["dependencies"]) for task, data in task_data.items()}
+    successors = {task: [] for task in task_data}
+    for task, data in task_data.items():
+        for dep in data["dependencies"]:
+            successors[dep].append(task)
+    ready = [task for task, count in remaining_deps.items() if count == 0]
+    visited = 0
+    while ready:
+        task = ready.pop()
+        visited += 1
+        for succ in successors[task]:
+            remaining_deps[succ] -= 1
+            if remaining_deps[succ] == 0:
+                ready.append(succ)
+    if visited != len(task_data):
+        raise Exception("Le graphe généré contient un cycle !")
+
+def generate_and_save(num_tasks, max_dependencies, random_seed, legacy=False, validate=False):
+    """ Génère et sauvegarde un graphe de la grille (exécuté dans un processus du pool) """
+    G, task_data, random_seed, max_dependencies = generate_task_graph(num_tasks, max_dependencies, random_seed, legacy)
+    if validate:
+        check_acyclic(task_data)
+    return save_graph_to_json(task_data, num_tasks, max_dependencies, random_seed, legacy, verbose=False)
+
+def generate_grid(num_tasks_values, max_dependencies_values, seeds=None, num_seeds=1, base_seed=0, legacy=False, workers=None,
+                  validate=False):
+    """
+    Génère en parallèle (un processus par cœur par défaut) la grille num_tasks x max_dependencies x graines,
+    chaque processus écrivant ses fichiers au fur et à mesure. Sans seeds, num_seeds graines par point de la
+    grille sont dérivées de base_seed.
+    """
+    jobs = []
+    for num_tasks in num_tasks_values:
+        for max_dependencies in max_dependencies_values:
+            point_seeds = seeds if seeds is not None else [derive_seed(base_seed, num_tasks, max_dependencies, r)
+                                                           for r in range(num_seeds)]
+            jobs.extend((num_tasks, max_dependencies, seed, legacy, validate) for seed in point_seeds)
+
+    with multiprocessing.Pool(workers) as pool:
+        filenames = pool.starmap(generate_and_save, jobs, chunksize=1)
+    print(f"\n✅ {len(filenames)} graphes sauvegardés")
+    return filenames
 
 def main():
     """ Fonction principale du script """
     parser = argparse.ArgumentParser(description="Génère un graphe de tâches avec dépendances aléatoires et l'enregistre en JSON.")
     
-    # Argument obligatoire : nombre de tâches
-    parser.add_argument("--num_tasks", type=int, required=True, help="Nombre de tâches à générer.")
+    # Argument obligatoire : nombre de tâches (plusieurs valeurs : grille de graphes)
+    parser.add_argument("--num_tasks", type=int, nargs="+", required=True, help="Nombre de tâches à générer.")
     
     # Argument optionnel : seed aléatoire
-    parser.add_argument("--seed", type=int, required=False, help="Graine aléatoire pour reproduire le graphe (optionnel).")
+    parser.add_argument("--seed", type=int, nargs="+", required=False, help="Graine aléatoire pour reproduire le graphe (optionnel).")
 
     # Argument optionnel : nombre maximal de dépendances
-    parser.add_argument("--max_dependencies", type=int, required=False, help="Nombre maximal de dépendances par tâche (optionnel, aléatoire si absent).")
+    parser.add_argument("--max_dependencies", type=int, nargs="+", required=False, help="Nombre maximal de dépendances par tâche (optionnel, aléatoire si absent).")
+
+    # Options de la génération d'une grille de graphes, en parallèle
+    parser.add_argument("--num_seeds", type=int, required=False, help="Nombre de graphes par point de la grille, de graines dérivées de --base_seed.")
+    parser.add_argument("--base_seed", type=int, default=0, help="Graine dont sont dérivées celles de la grille (0 par défaut).")
+    parser.add_argument("--workers", type=int, required=False, help="Nombre de processus (un par cœur par défaut).")
+
+    # Option : reproduire les graphes de l'ancien générateur
+    parser.add_argument("--legacy", action="store_true", help="Reproduit, à graine égale, les graphes de l'ancien générateur.")
+
+    # Option : vérifier que les graphes générés sont acycliques (ils le sont par construction)
+    parser.add_argument("--validate", action="store_true", help="Vérifie que chaque graphe généré est acyclique.")
 
     args = parser.parse_args()
+    max_dependencies_values = args.max_dependencies or [None]
+
+    # Plusieurs graphes : grille générée en parallèle, sans affichage
+    if len(args.num_tasks) > 1 or len(max_dependencies_values) > 1 or len(args.seed or []) > 1 or args.num_seeds:
+        generate_grid(args.num_tasks, max_dependencies_values, args.seed, args.num_seeds or 1, args.base_seed,
+                      args.legacy, args.workers, args.validate)
+        return
 
     # Générer le graphe avec ou sans seed et max_dependencies
     G, task_data, random_seed, max_dependencies = generate_task_graph(
-        num_tasks=args.num_tasks, 
-        max_dependencies=args.max_dependencies, 
-        random_seed=args.seed
+        num_tasks=args.num_tasks[0], 
+        max_dependencies=max_dependencies_values[0], 
+        random_seed=args.seed[0] if args.seed else None,
+        legacy=args.legacy
     )
 
-    assert nx.is_directed_acyclic_graph(G), "Le graphe généré contient un cycle !"
+    if args.validate:
+        check_acyclic(task_data)
 
     # Sauvegarde en JSON
-    save_graph_to_json(task_data, args.num_tasks, max_dependencies, random_seed)
+    save_graph_to_json(task_data, args.num_tasks[0], max_dependencies, random_seed, args.legacy)
 
 
 